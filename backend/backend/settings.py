@@ -216,6 +216,72 @@ DATABASES = {
     }
 }
 
+# Connection pool used by the fetch_one / fetch_all / execute helpers
+DB_POOL = {
+    "MIN_SIZE": int(os.getenv("DB_POOL_MIN_SIZE", 2)),
+    "MAX_SIZE": int(os.getenv("DB_POOL_MAX_SIZE", 20)),
+    "TIMEOUT": float(os.getenv("DB_POOL_TIMEOUT", 10)),
+    "MAX_IDLE": int(os.getenv("DB_POOL_MAX_IDLE", 300)),
+    "MAX_LIFETIME": int(os.getenv("DB_POOL_MAX_LIFETIME", 3600)),
+    "HEALTH_CHECK_AFTER": int(os.getenv("DB_POOL_HEALTH_CHECK_AFTER", 30)),
+    "REAP_INTERVAL": int(os.getenv("DB_POOL_REAP_INTERVAL", 30)),
+    # Per-connection prepared statement cache; 0 disables PREPARE/EXECUTE
+    "STATEMENT_CACHE_SIZE": int(os.getenv("DB_STATEMENT_CACHE_SIZE", 100)),
+}
+# Rows fetched per round trip by fetch_iter's server-side cursors
+DB_STREAM_ITERSIZE = int(os.getenv("DB_STREAM_ITERSIZE", 2000))
+
+# Full rebuild interval of the in-process patient name autocomplete index
+PATIENT_SUGGEST_REFRESH_SECONDS = int(os.getenv("PATIENT_SUGGEST_REFRESH_SECONDS", 600))
+
+# Result cache for /patients/display/ (per worker process)
+PATIENT_LIST_CACHE = {
+    "MAXSIZE": int(os.getenv("PATIENT_LIST_CACHE_MAXSIZE", 512)),
+    "TTL": int(os.getenv("PATIENT_LIST_CACHE_TTL", 30)),
+}
+
+# Single-patient record cache used by /patients/display/<id> (per worker process)
+PATIENT_ENTITY_CACHE = {
+    "MAX_BYTES": int(os.getenv("PATIENT_ENTITY_CACHE_MAX_BYTES", 4 * 1024 * 1024)),
+    "TTL": int(os.getenv("PATIENT_ENTITY_CACHE_TTL", 60)),
+    "NEGATIVE_TTL": int(os.getenv("PATIENT_ENTITY_CACHE_NEGATIVE_TTL", 30)),
+    "NEGATIVE_MAXSIZE": int(os.getenv("PATIENT_ENTITY_CACHE_NEGATIVE_MAXSIZE", 10000)),
+}
+
+# Upper bound on ids accepted by /patients/display/batch/
+PATIENT_BATCH_MAX_IDS = int(os.getenv("PATIENT_BATCH_MAX_IDS", 100))
+
+# /patients/changes/ holds back rows changed in the last N seconds so
+# transactions still in flight cannot land behind an issued cursor
+PATIENT_CHANGES_LAG_SECONDS = int(os.getenv("PATIENT_CHANGES_LAG_SECONDS", 5))
+
+# /patients/import/: rows per COPY round trip and per-row errors reported
+PATIENT_IMPORT = {
+    "COPY_CHUNK_ROWS": int(os.getenv("PATIENT_IMPORT_COPY_CHUNK_ROWS", 5000)),
+    "MAX_ERRORS": int(os.getenv("PATIENT_IMPORT_MAX_ERRORS", 1000)),
+}
+
+# Upper bound on doctors accepted by one /doctor/add/bulk/ request
+DOCTOR_BULK_MAX_ROWS = int(os.getenv("DOCTOR_BULK_MAX_ROWS", 500))
+
+# In-process genders/qualifications registry (per worker process); MAX_AGE
+# is the Cache-Control max-age sent with /doctor/genders/ and /doctor/qualifications/
+REFERENCE_DATA = {
+    "TTL": int(os.getenv("REFERENCE_DATA_TTL", 3600)),
+    "MAX_AGE": int(os.getenv("REFERENCE_DATA_MAX_AGE", 300)),
+}
+
+# Serialized doctor profile cache used by /doctor/profile/<id> (per worker process)
+DOCTOR_PROFILE_CACHE = {
+    "MAXSIZE": int(os.getenv("DOCTOR_PROFILE_CACHE_MAXSIZE", 1024)),
+    "TTL": int(os.getenv("DOCTOR_PROFILE_CACHE_TTL", 300)),
+}
+
+# Wall-clock zone of doctor working-hour templates and naive schedule input
+HOSPITAL_TIME_ZONE = os.getenv("HOSPITAL_TIME_ZONE", "Asia/Kolkata")
+# Longest range one /doctor/availability/ request may cover
+AVAILABILITY_MAX_DAYS = int(os.getenv("AVAILABILITY_MAX_DAYS", 31))
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -4,11 +4,14 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from service_app.views import DbPoolStats
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("patients/", include("patient.urls")),
     path("user/", include("users.urls")),
     path("doctor/", include("doctor.urls")),
+    path("metrics/db-pool/", DbPoolStats.as_view(), name="db_pool_stats"),
 ]
 
 if settings.DEBUG:
@@ -0,0 +1,66 @@
+# Hospital_Management\backend\doctor\doctor_service\appointments.py
+from django.conf import settings
+from django.http import HttpRequest
+from rest_framework import status
+from rest_framework.response import Response
+
+from .db import fetch_one
+
+# book_appointment() result codes -> (HTTP status, machine-readable code, message)
+BOOKING_ERRORS = {
+    -1: (status.HTTP_404_NOT_FOUND, "doctor_not_found", "Doctor not found or inactive"),
+    -2: (
+        status.HTTP_400_BAD_REQUEST,
+        "not_a_slot",
+        "starts_at is not a slot start within the doctor's working hours",
+    ),
+    -3: (status.HTTP_409_CONFLICT, "doctor_unavailable", "Doctor is on leave at that time"),
+    -4: (status.HTTP_409_CONFLICT, "slot_taken", "Slot is already booked"),
+    -5: (
+        status.HTTP_409_CONFLICT,
+        "patient_busy",
+        "Patient already has an appointment at that time",
+    ),
+    -6: (status.HTTP_404_NOT_FOUND, "patient_not_found", "Patient not found or inactive"),
+    -7: (status.HTTP_400_BAD_REQUEST, "slot_in_past", "starts_at is in the past"),
+}
+
+
+def book_appointment(self, request: HttpRequest, doctor_id: int):
+    serializer = self.get_serializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    data = serializer.validated_data
+
+    result = fetch_one(
+        "SELECT book_appointment(%s, %s, %s, %s, %s, %s) AS appointment_id",
+        [
+            doctor_id,
+            data["patient_id"],
+            data["starts_at"],
+            data.get("reason") or None,
+            request.user.user_id,
+            getattr(settings, "HOSPITAL_TIME_ZONE", "UTC"),
+        ],
+    )
+    appointment_id = result["appointment_id"]
+
+    if appointment_id in BOOKING_ERRORS:
+        http_status, code, message = BOOKING_ERRORS[appointment_id]
+        return Response({"error": message, "code": code}, status=http_status)
+
+    return Response(
+        {"message": "Appointment booked", "appointment_id": appointment_id},
+        status=status.HTTP_201_CREATED,
+    )
+
+
+def cancel_appointment(self, request: HttpRequest, appointment_id: int):
+    result = fetch_one(
+        "SELECT cancel_appointment(%s) AS cancelled", [appointment_id]
+    )
+    if not result["cancelled"]:
+        return Response(
+            {"error": "Appointment not found or already cancelled"},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+    return Response({"message": "Appointment cancelled"}, status=status.HTTP_200_OK)
@@ -0,0 +1,124 @@
+# Hospital_Management\backend\doctor\doctor_service\doctor_directory.py
+import base64
+import binascii
+import json
+from decimal import Decimal, InvalidOperation
+
+from django.http import HttpRequest
+from rest_framework import status
+from rest_framework.response import Response
+
+from .db import fetch_all
+
+SORTS = ("name", "fee", "experience")
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+def encode_cursor(order: str, sort_key: str, doctor_id: int) -> str:
+    raw = json.dumps([order, sort_key, doctor_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order: str):
+    """Returns (sort_key, doctor_id), or None if malformed or for another sort order."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_order, sort_key, doctor_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError, binascii.Error, UnicodeDecodeError):
+        return None
+    if cursor_order != order or not isinstance(sort_key, str) or not isinstance(doctor_id, int):
+        return None
+    return sort_key, doctor_id
+
+
+def _decimal_param(params, name):
+    """Returns (value, error); value is None when the filter is not given."""
+    raw = params.get(name)
+    if raw in (None, ""):
+        return None, None
+    try:
+        value = Decimal(raw)
+    except InvalidOperation:
+        return None, f"{name} must be a number"
+    if not value.is_finite():
+        return None, f"{name} must be a number"
+    return value, None
+
+
+def doctor_directory(self, request: HttpRequest):
+    params = request.query_params
+
+    order = params.get("sort", "name") or "name"
+    descending = order.startswith("-")
+    sort = order[1:] if descending else order
+    if sort not in SORTS:
+        return Response(
+            {"error": "sort must be one of: name, fee, experience (prefix - for descending)"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    try:
+        limit = int(params.get("limit", DEFAULT_LIMIT))
+    except (ValueError, TypeError):
+        limit = DEFAULT_LIMIT
+    limit = max(1, min(limit, MAX_LIMIT))
+
+    gender_id = params.get("gender_id") or None
+    if gender_id is not None:
+        if not gender_id.isdecimal():
+            return Response(
+                {"error": "gender_id must be an integer"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        gender_id = int(gender_id)
+
+    filters = {}
+    for name in ("min_fee", "max_fee", "min_experience"):
+        filters[name], error = _decimal_param(params, name)
+        if error:
+            return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+
+    after_key = after_id = None
+    cursor = params.get("cursor") or ""
+    if cursor:
+        position = decode_cursor(cursor, order)
+        if position is None:
+            return Response(
+                {"error": "Invalid cursor"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        after_key, after_id = position
+
+    rows = fetch_all(
+        "SELECT * FROM get_doctor_directory(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+        [
+            params.get("qualification") or None,
+            gender_id,
+            filters["min_fee"],
+            filters["max_fee"],
+            filters["min_experience"],
+            sort,
+            descending,
+            after_key,
+            after_id,
+            limit + 1,
+        ],
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor(order, last["sort_key"], last["doctor_id"])
+
+    serializer = self.get_serializer(rows, many=True)
+    return Response(
+        {
+            "data": serializer.data,
+            "next_cursor": next_cursor,
+            "has_more": has_more,
+        },
+        status=status.HTTP_200_OK,
+    )
@@ -0,0 +1,98 @@
+# Hospital_Management\backend\doctor\doctor_service\profile_cache.py
+import threading
+
+from cachetools import TTLCache
+from django.conf import settings
+
+from service_app.conditional import make_validators
+
+from ..serializers import DoctorProfileSerializer
+from .db import fetch_one
+
+
+class ProfileEntry:
+    __slots__ = ("data", "etag", "last_modified")
+
+    def __init__(self, data, etag, last_modified):
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+def load_doctor_profile(doctor_id):
+    """Reads and serializes one profile; None if there is no active doctor."""
+    row = fetch_one("SELECT * FROM get_doctor_profile(%s)", [doctor_id])
+    if not row:
+        return None
+    etag = last_modified = None
+    if row.get("updated_at") is not None:
+        etag, last_modified = make_validators("doctor", doctor_id, row["updated_at"])
+    return ProfileEntry(dict(DoctorProfileSerializer(row).data), etag, last_modified)
+
+
+class DoctorProfileCache:
+    """
+    LRU + TTL cache of serialized doctor profiles (payload and validators),
+    so a hit costs neither a query nor a DoctorProfileSerializer pass.
+    Updates in this process invalidate at once; other worker processes
+    converge within the TTL.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self._cache = TTLCache(maxsize, ttl)
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; a load that overlapped a write is not stored.
+        self._writes = 0
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, doctor_id, loader):
+        with self._lock:
+            entry = self._cache.get(doctor_id)
+            if entry is not None:
+                self._hits += 1
+                return entry
+            self._misses += 1
+            writes = self._writes
+
+        entry = loader()
+
+        with self._lock:
+            if entry is not None and writes == self._writes:
+                self._cache[doctor_id] = entry
+        return entry
+
+    def put(self, doctor_id, entry):
+        with self._lock:
+            self._cache[doctor_id] = entry
+
+    def invalidate(self, doctor_id):
+        with self._lock:
+            self._writes += 1
+            self._cache.pop(doctor_id, None)
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+                "size": len(self._cache),
+                "maxsize": self._cache.maxsize,
+                "ttl": self._cache.ttl,
+            }
+
+
+_conf = getattr(settings, "DOCTOR_PROFILE_CACHE", {})
+profile_cache = DoctorProfileCache(_conf.get("MAXSIZE", 1024), _conf.get("TTL", 300))
+
+
+def warm_doctor_profile(doctor_id):
+    """Preloads a new doctor's profile; failures are left to the next read."""
+    try:
+        entry = load_doctor_profile(doctor_id)
+    except Exception:
+        return
+    if entry is not None:
+        profile_cache.put(doctor_id, entry)
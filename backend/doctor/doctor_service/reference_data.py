@@ -0,0 +1,122 @@
+# Hospital_Management\backend\doctor\doctor_service\reference_data.py
+import hashlib
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.utils.http import quote_etag
+
+from .db import fetch_all
+
+
+class _Snapshot:
+    __slots__ = ("genders", "qualifications", "gender_labels", "qualification_codes", "etags")
+
+    def __init__(self, genders, qualifications):
+        self.genders = [
+            {"gender_id": r["gender_id"], "gender_value": r["gender_value"]}
+            for r in genders
+        ]
+        self.qualifications = [
+            {
+                "qualification_id": r["qualification_id"],
+                "qualification_code": r["qualification_code"],
+                "qualification_name": r["qualification_name"],
+            }
+            for r in qualifications
+        ]
+        self.gender_labels = {g["gender_id"]: g["gender_value"] for g in self.genders}
+        self.qualification_codes = {
+            q["qualification_id"]: q["qualification_code"] for q in self.qualifications
+        }
+        # Content hashes, so every worker holding the same data sends the same ETag.
+        self.etags = {
+            "genders": _etag("genders", self.genders),
+            "qualifications": _etag("qualifications", self.qualifications),
+        }
+
+
+def _etag(kind, rows):
+    payload = json.dumps(rows, sort_keys=True, separators=(",", ":"))
+    return quote_etag(hashlib.sha1(f"{kind}:{payload}".encode()).hexdigest()[:20])
+
+
+class ReferenceData:
+    """
+    In-process copy of the genders and qualifications lookup tables. Loaded
+    on first use and reloaded after `ttl` seconds, or at once via reload()
+    when the tables are edited. Each load replaces one immutable snapshot,
+    so readers never see a half-updated registry.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._snapshot = None
+        self._loaded_at = None
+        self._version = 0
+        self._loading = threading.Lock()
+
+    def _load(self):
+        snapshot = _Snapshot(
+            fetch_all("SELECT * FROM get_genders()", []),
+            fetch_all("SELECT * FROM get_qualifications()", []),
+        )
+        self._snapshot = snapshot
+        self._loaded_at = time.monotonic()
+        self._version += 1
+
+    def reload(self):
+        """Re-reads both tables now; call after changing genders or qualifications."""
+        with self._loading:
+            self._load()
+            return self._version
+
+    def _current(self):
+        if self._snapshot is None:
+            with self._loading:
+                if self._snapshot is None:
+                    self._load()
+            return self._snapshot
+
+        stale = time.monotonic() - self._loaded_at > self.ttl
+        # Only one request pays for a reload; the rest keep the old snapshot.
+        if stale and self._loading.acquire(blocking=False):
+            try:
+                self._load()
+            except Exception:
+                # Keep serving the last good copy if Postgres is unavailable.
+                pass
+            finally:
+                self._loading.release()
+        return self._snapshot
+
+    @property
+    def version(self):
+        return self._version
+
+    def genders(self):
+        return self._current().genders
+
+    def qualifications(self):
+        return self._current().qualifications
+
+    def etag(self, kind):
+        return self._current().etags[kind]
+
+    def gender_label(self, gender_id):
+        """Label for a gender_id, or None if unknown."""
+        return self._current().gender_labels.get(gender_id)
+
+    def qualification_code(self, qualification_id):
+        """Code for an active qualification_id, or None if unknown."""
+        return self._current().qualification_codes.get(qualification_id)
+
+    def qualification_codes(self, qualification_ids):
+        codes = self._current().qualification_codes
+        return sorted(codes[i] for i in qualification_ids if i in codes)
+
+
+reference_data = ReferenceData(
+    getattr(settings, "REFERENCE_DATA", {}).get("TTL", 3600)
+)
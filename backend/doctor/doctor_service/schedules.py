@@ -0,0 +1,216 @@
+# Hospital_Management\backend\doctor\doctor_service\schedules.py
+import json
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpRequest
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import status
+from rest_framework.response import Response
+
+from .db import fetch_all, fetch_one
+
+MAX_SLOTS_PER_WINDOW = 96
+
+
+def hospital_tz():
+    return ZoneInfo(getattr(settings, "HOSPITAL_TIME_ZONE", "UTC"))
+
+
+def parse_moment(value: str, end_of_day=False):
+    """
+    ISO date or datetime from a query string. Naive values are hospital
+    local time; a bare date means the start of that day, or the end of it
+    (next midnight) when end_of_day is set. Returns None if unparseable.
+    """
+    if not value:
+        return None
+    try:
+        day = parse_date(value)
+        moment = None if day is not None else parse_datetime(value)
+    except ValueError:
+        return None
+    if day is not None:
+        if end_of_day:
+            day += timedelta(days=1)
+        moment = datetime.combine(day, time.min)
+    if moment is None:
+        return None
+    if timezone.is_naive(moment):
+        moment = moment.replace(tzinfo=hospital_tz())
+    return moment
+
+
+def get_schedule(self, request: HttpRequest, doctor_id: int):
+    weekly = fetch_all("SELECT * FROM get_doctor_schedule(%s)", [doctor_id])
+    exceptions = fetch_all(
+        "SELECT * FROM get_doctor_schedule_exceptions(%s, %s)",
+        [doctor_id, timezone.now()],
+    )
+    serializer = self.get_serializer({"entries": weekly})
+    return Response(
+        {
+            "doctor_id": doctor_id,
+            "time_zone": getattr(settings, "HOSPITAL_TIME_ZONE", "UTC"),
+            "entries": serializer.data["entries"],
+            "exceptions": [
+                {
+                    "exception_id": row["exception_id"],
+                    "starts_at": row["starts_at"],
+                    "ends_at": row["ends_at"],
+                    "reason": row["reason"],
+                }
+                for row in exceptions
+            ],
+        },
+        status=status.HTTP_200_OK,
+    )
+
+
+def replace_schedule(self, request: HttpRequest, doctor_id: int):
+    serializer = self.get_serializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+
+    result = fetch_one(
+        "SELECT replace_doctor_schedule(%s, %s::jsonb) AS result",
+        [
+            doctor_id,
+            json.dumps(serializer.validated_data["entries"], cls=DjangoJSONEncoder),
+        ],
+    )
+
+    if result["result"] == -1:
+        return Response(
+            {"error": "Doctor not found or inactive"},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+    if result["result"] == -2:
+        return Response(
+            {"error": "Schedule entries overlap"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    return Response(
+        {"message": "Schedule updated successfully"},
+        status=status.HTTP_200_OK,
+    )
+
+
+def add_exception(self, request: HttpRequest, doctor_id: int):
+    serializer = self.get_serializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    data = serializer.validated_data
+
+    result = fetch_one(
+        "SELECT add_doctor_schedule_exception(%s, %s, %s, %s) AS exception_id",
+        [doctor_id, data["starts_at"], data["ends_at"], data.get("reason") or None],
+    )
+
+    if result["exception_id"] == -1:
+        return Response(
+            {"error": "Doctor not found or inactive"},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+
+    return Response(
+        {"message": "Exception added", "exception_id": result["exception_id"]},
+        status=status.HTTP_201_CREATED,
+    )
+
+
+def delete_exception(self, request: HttpRequest, doctor_id: int, exception_id: int):
+    result = fetch_one(
+        "SELECT delete_doctor_schedule_exception(%s, %s) AS deleted",
+        [doctor_id, exception_id],
+    )
+    if not result["deleted"]:
+        return Response(
+            {"error": "Exception not found"},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+    return Response({"message": "Exception deleted"}, status=status.HTTP_200_OK)
+
+
+def _window_payload(row, expand_slots):
+    start, end = row["window_start"], row["window_end"]
+    step = timedelta(minutes=row["slot_minutes"])
+    slots = int((end - start) / step)
+    window = {
+        "start": start,
+        "end": end,
+        "slot_minutes": row["slot_minutes"],
+        "slots": slots,
+    }
+    if expand_slots:
+        window["slot_starts"] = [
+            start + step * i for i in range(min(slots, MAX_SLOTS_PER_WINDOW))
+        ]
+    return window
+
+
+def doctor_availability(self, request: HttpRequest):
+    params = request.query_params
+    max_days = getattr(settings, "AVAILABILITY_MAX_DAYS", 31)
+
+    start = parse_moment(params.get("start", ""))
+    end = parse_moment(params.get("end", ""), end_of_day=True)
+    if start is None or end is None:
+        return Response(
+            {"error": "start and end are required ISO dates or datetimes"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if end <= start:
+        return Response(
+            {"error": "end must be after start"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if end - start > timedelta(days=max_days):
+        return Response(
+            {"error": f"The range can span at most {max_days} days"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    doctor_ids = None
+    raw_ids = params.get("doctor_ids", "") or ""
+    if raw_ids:
+        parts = [part.strip() for part in raw_ids.split(",") if part.strip()]
+        if not all(part.isdecimal() for part in parts):
+            return Response(
+                {"error": "doctor_ids must be a comma separated list of integers"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        doctor_ids = sorted({int(part) for part in parts})
+
+    rows = fetch_all(
+        "SELECT * FROM get_doctor_availability(%s, %s, %s, %s, %s)",
+        [
+            doctor_ids,
+            params.get("qualification") or None,
+            start,
+            end,
+            getattr(settings, "HOSPITAL_TIME_ZONE", "UTC"),
+        ],
+    )
+
+    expand_slots = params.get("expand") == "slots"
+    by_doctor = {}
+    for row in rows:
+        by_doctor.setdefault(row["doctor_id"], []).append(
+            _window_payload(row, expand_slots)
+        )
+
+    return Response(
+        {
+            "start": start,
+            "end": end,
+            "time_zone": getattr(settings, "HOSPITAL_TIME_ZONE", "UTC"),
+            "data": [
+                {"doctor_id": doctor_id, "windows": windows}
+                for doctor_id, windows in by_doctor.items()
+            ],
+        },
+        status=status.HTTP_200_OK,
+    )
@@ -1,5 +1,8 @@
 # Hospital_Management\backend\doctor\serializers.py
 import re
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
 from rest_framework import serializers
 
 import re
@@ -47,7 +50,15 @@ class RegisterDoctorSerializer(BaseValidation, serializers.Serializer):
     )
 
     def validate_qualification_ids(self, value):
-        return self.validate_qualification_ids(value)
+        return BaseValidation.validate_qualification_ids(value)
+
+
+class BulkRegisterDoctorSerializer(serializers.Serializer):
+    # Rows are validated one by one with RegisterDoctorSerializer so a bad
+    # row is reported without rejecting the whole batch.
+    doctors = serializers.ListField(
+        child=serializers.DictField(), allow_empty=False
+    )
 
 
 class UpdateDoctorSerializer(BaseValidation, serializers.Serializer):
@@ -63,15 +74,13 @@ class UpdateDoctorSerializer(BaseValidation, serializers.Serializer):
     consultation_fee = serializers.DecimalField(
         max_digits=10, decimal_places=2, min_value=0, required=False, allow_null=True
     )
-    profile_image = serializers.CharField(
-        required=False, allow_blank=True, allow_null=True
-    )
+    profile_image = serializers.ImageField(required=False, allow_null=True)
     qualification_ids = serializers.ListField(
         child=serializers.IntegerField(min_value=1), allow_empty=False
     )
 
     def validate_qualification_ids(self, value):
-        return self.validate_qualification_ids(value)
+        return BaseValidation.validate_qualification_ids(value)
 
 
 class DoctorProfileSerializer(serializers.Serializer):
@@ -100,6 +109,18 @@ class DoctorListSerializer(serializers.Serializer):
     qualifications = serializers.ListField(child=serializers.CharField())
 
 
+class DoctorDirectorySerializer(serializers.Serializer):
+    doctor_id = serializers.IntegerField()
+    full_name = serializers.CharField()
+    gender = serializers.CharField(allow_null=True)
+    email = serializers.EmailField(allow_null=True)
+    consultation_fee = serializers.DecimalField(
+        max_digits=10, decimal_places=2, allow_null=True
+    )
+    experience_years = serializers.DecimalField(max_digits=4, decimal_places=2)
+    qualifications = serializers.ListField(child=serializers.CharField())
+
+
 class GenderSerializer(serializers.Serializer):
     gender_id = serializers.IntegerField()
     gender_value = serializers.CharField()
@@ -109,3 +130,53 @@ class QualificationSerializer(serializers.Serializer):
     qualification_id = serializers.IntegerField()
     qualification_code = serializers.CharField()
     qualification_name = serializers.CharField()
+
+
+class ScheduleEntrySerializer(serializers.Serializer):
+    schedule_id = serializers.IntegerField(read_only=True)
+    weekday = serializers.IntegerField(min_value=1, max_value=7)  # ISO: 1 = Monday
+    start_time = serializers.TimeField()
+    end_time = serializers.TimeField()
+    slot_minutes = serializers.IntegerField(min_value=5, max_value=240, default=15)
+    valid_from = serializers.DateField(required=False, allow_null=True)
+    valid_to = serializers.DateField(required=False, allow_null=True)
+
+    def validate(self, attrs):
+        if attrs["end_time"] <= attrs["start_time"]:
+            raise serializers.ValidationError("end_time must be after start_time.")
+        valid_from, valid_to = attrs.get("valid_from"), attrs.get("valid_to")
+        if valid_from and valid_to and valid_to < valid_from:
+            raise serializers.ValidationError("valid_to must not be before valid_from.")
+        return attrs
+
+
+class DoctorScheduleSerializer(serializers.Serializer):
+    entries = ScheduleEntrySerializer(many=True)
+
+
+class ScheduleExceptionSerializer(serializers.Serializer):
+    # Naive datetimes are hospital local time, like the weekly template.
+    starts_at = serializers.DateTimeField(
+        default_timezone=ZoneInfo(getattr(settings, "HOSPITAL_TIME_ZONE", "UTC"))
+    )
+    ends_at = serializers.DateTimeField(
+        default_timezone=ZoneInfo(getattr(settings, "HOSPITAL_TIME_ZONE", "UTC"))
+    )
+    reason = serializers.CharField(
+        max_length=200, required=False, allow_null=True, allow_blank=True
+    )
+
+    def validate(self, attrs):
+        if attrs["ends_at"] <= attrs["starts_at"]:
+            raise serializers.ValidationError("ends_at must be after starts_at.")
+        return attrs
+
+
+class BookAppointmentSerializer(serializers.Serializer):
+    patient_id = serializers.IntegerField(min_value=1)
+    starts_at = serializers.DateTimeField(
+        default_timezone=ZoneInfo(getattr(settings, "HOSPITAL_TIME_ZONE", "UTC"))
+    )
+    reason = serializers.CharField(
+        max_length=200, required=False, allow_null=True, allow_blank=True
+    )
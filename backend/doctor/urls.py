@@ -1,15 +1,58 @@
 from django.urls import path
-from .views import AddDoctor, DoctorProfile, DoctoreList, GenderList, QualificationList, UpdateDoctor
+from .views import (
+    AddDoctor,
+    AddDoctorsBulk,
+    BookAppointment,
+    CancelAppointment,
+    DeleteDoctorScheduleException,
+    DoctorAvailability,
+    DoctorDirectory,
+    DoctorProfile,
+    DoctorProfileCacheStats,
+    DoctorSchedule,
+    DoctorScheduleExceptions,
+    DoctoreList,
+    GenderList,
+    QualificationList,
+    ReloadReferenceData,
+    UpdateDoctor,
+)
 from django.conf import settings
 from django.conf.urls.static import static
 
 urlpatterns = [
     path("add/", AddDoctor.as_view(), name="add_doctor"),
+    path("add/bulk/", AddDoctorsBulk.as_view(), name="add_doctors_bulk"),
     path("list/", DoctoreList.as_view(), name="display_doctor"),
+    path("directory/", DoctorDirectory.as_view(), name="doctor_directory"),
     path("profile/<int:doctor_id>",DoctorProfile.as_view(),name="display_doctor_details"),
+    path("profile/cache/stats/", DoctorProfileCacheStats.as_view(), name="doctor_profile_cache_stats"),
     path("update/<int:doctor_id>/", UpdateDoctor.as_view(), name="update_doctor"),
     path("genders/", GenderList.as_view(), name="gender_list"),
     path("qualifications/", QualificationList.as_view(), name="qualification_list"),
+    path("reference-data/reload/", ReloadReferenceData.as_view(), name="reload_reference_data"),
+    path("schedule/<int:doctor_id>/", DoctorSchedule.as_view(), name="doctor_schedule"),
+    path(
+        "schedule/<int:doctor_id>/exceptions/",
+        DoctorScheduleExceptions.as_view(),
+        name="doctor_schedule_exceptions",
+    ),
+    path(
+        "schedule/<int:doctor_id>/exceptions/<int:exception_id>/",
+        DeleteDoctorScheduleException.as_view(),
+        name="delete_doctor_schedule_exception",
+    ),
+    path("availability/", DoctorAvailability.as_view(), name="doctor_availability"),
+    path(
+        "appointments/<int:doctor_id>/book/",
+        BookAppointment.as_view(),
+        name="book_appointment",
+    ),
+    path(
+        "appointments/<int:appointment_id>/cancel/",
+        CancelAppointment.as_view(),
+        name="cancel_appointment",
+    ),
 
     # path("delete/<int:patient_id>", DeleteDoctor.as_view(), name="delete_doctor"),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -5,18 +5,47 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from users.authentication import JWTAuthentication
 from .serializers import (
+    BookAppointmentSerializer,
+    BulkRegisterDoctorSerializer,
+    DoctorDirectorySerializer,
+    DoctorScheduleSerializer,
     DoctorListSerializer,
     GenderSerializer,
     QualificationSerializer,
     RegisterDoctorSerializer,
     UpdateDoctorSerializer,
     DoctorProfileSerializer,
+    ScheduleExceptionSerializer,
 )
+from .doctor_service.appointments import book_appointment, cancel_appointment
 from .doctor_service.db import fetch_one, fetch_all
+from .doctor_service.doctor_directory import doctor_directory
+from .doctor_service.profile_cache import (
+    load_doctor_profile,
+    profile_cache,
+    warm_doctor_profile,
+)
+from .doctor_service.reference_data import reference_data
+from .doctor_service.schedules import (
+    add_exception,
+    delete_exception,
+    doctor_availability,
+    get_schedule,
+    replace_schedule,
+)
+import json
 import os
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.cache import patch_cache_control
 
 from service_app.image_process import get_image_path
+from service_app.conditional import (
+    is_conditional,
+    make_validators,
+    not_modified_response,
+    set_validators,
+)
 
 
 class AddDoctor(generics.GenericAPIView):
@@ -69,6 +98,8 @@ class AddDoctor(generics.GenericAPIView):
                     status=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 )
 
+            warm_doctor_profile(doctor_id)
+
             return Response(
                 {"message": "Doctor created successfully", "doctor_id": doctor_id},
                 status=status.HTTP_201_CREATED,
@@ -81,25 +112,142 @@ class AddDoctor(generics.GenericAPIView):
             )
 
 
+BULK_ERRORS = {
+    -1: "Email or phone number already exists",
+    -2: "Invalid gender or qualification",
+}
+
+
+class AddDoctorsBulk(generics.GenericAPIView):
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    serializer_class = BulkRegisterDoctorSerializer
+
+    def post(self, request: HttpRequest):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        doctors = serializer.validated_data["doctors"]
+
+        max_rows = getattr(settings, "DOCTOR_BULK_MAX_ROWS", 500)
+        if len(doctors) > max_rows:
+            return Response(
+                {"error": f"At most {max_rows} doctors can be registered at once"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        results = {}
+        valid_rows = []
+        for row_no, doctor in enumerate(doctors):
+            row = RegisterDoctorSerializer(data=doctor)
+            if not row.is_valid():
+                results[row_no] = {"row": row_no, "error": row.errors}
+                continue
+            data = row.validated_data
+            valid_rows.append(
+                {
+                    "row_no": row_no,
+                    "full_name": data["full_name"],
+                    "experience_years": data["experience_years"],
+                    "gender_id": data.get("gender_id"),
+                    "phone_number": data["phone_number"],
+                    "email": data.get("email"),
+                    "consultation_fee": data.get("consultation_fee"),
+                    "profile_image": data.get("profile_image") or None,
+                    "joining_date": data.get("joining_date"),
+                    "qualification_ids": data["qualification_ids"],
+                }
+            )
+
+        if valid_rows:
+            try:
+                outcomes = fetch_all(
+                    "SELECT * FROM register_doctors_bulk(%s::jsonb)",
+                    [json.dumps(valid_rows, cls=DjangoJSONEncoder)],
+                )
+            except Exception as e:
+                return Response(
+                    {"error": str(e)},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                )
+
+            for outcome in outcomes:
+                doctor_id = outcome["doctor_id"]
+                if doctor_id in BULK_ERRORS:
+                    results[outcome["row_no"]] = {
+                        "row": outcome["row_no"],
+                        "error": BULK_ERRORS[doctor_id],
+                    }
+                else:
+                    results[outcome["row_no"]] = {
+                        "row": outcome["row_no"],
+                        "doctor_id": doctor_id,
+                    }
+
+        created = sum(1 for r in results.values() if "doctor_id" in r)
+        return Response(
+            {
+                "message": f"{created} of {len(doctors)} doctors created",
+                "created": created,
+                "failed": len(doctors) - created,
+                "results": [results[row_no] for row_no in sorted(results)],
+            },
+            status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST,
+        )
+
+
 class DoctorProfile(generics.GenericAPIView):
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = DoctorProfileSerializer
 
     def get(self, request, doctor_id: int):
-        result = fetch_one(
-            "SELECT * FROM get_doctor_profile(%s)",
-            [doctor_id],
-        )
+        # Revalidation only needs the version timestamp, not the full profile.
+        probe_etag = None
+        if is_conditional(request):
+            probe = fetch_one("SELECT * FROM doctor_version(%s)", [doctor_id])
+            if probe is not None and probe["version"] is not None:
+                probe_etag, last_modified = make_validators(
+                    "doctor", doctor_id, probe["version"]
+                )
+                res = not_modified_response(request, probe_etag, last_modified)
+                if res is not None:
+                    return set_validators(res, probe_etag, last_modified)
 
-        if not result:
+        def loader():
+            return load_doctor_profile(doctor_id)
+
+        entry = profile_cache.get(doctor_id, loader)
+        if entry is not None and probe_etag is not None and entry.etag != probe_etag:
+            # The probe saw a newer version than this worker cached.
+            profile_cache.invalidate(doctor_id)
+            entry = profile_cache.get(doctor_id, loader)
+
+        if entry is None:
             return Response(
                 {"error": "Doctor not found"},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        serializer = self.get_serializer(result)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        response = Response(entry.data, status=status.HTTP_200_OK)
+        if entry.etag is not None:
+            set_validators(response, entry.etag, entry.last_modified)
+        return response
+
+
+def _reference_response(request, kind, rows_fn, serializer_fn):
+    """Serves a reference-data list from memory with ETag/Cache-Control."""
+    etag = reference_data.etag(kind)
+    response = not_modified_response(request, etag, None)
+    if response is None:
+        serializer = serializer_fn(rows_fn(), many=True)
+        response = Response(serializer.data or [], status=status.HTTP_200_OK)
+    response["ETag"] = etag
+    patch_cache_control(
+        response,
+        private=True,
+        max_age=getattr(settings, "REFERENCE_DATA", {}).get("MAX_AGE", 300),
+    )
+    return response
 
 
 class GenderList(generics.GenericAPIView):
@@ -109,11 +257,9 @@ class GenderList(generics.GenericAPIView):
 
     def get(self, request: HttpRequest):
         try:
-            rows = fetch_all("SELECT * FROM get_genders()", [])
-            # print(rows)
-            serializer = self.get_serializer(rows, many=True)
-            # print(serializer.data)
-            return Response(serializer.data or [], status=status.HTTP_200_OK)
+            return _reference_response(
+                request, "genders", reference_data.genders, self.get_serializer
+            )
         except Exception as e:
             print(str(e))
             return Response(
@@ -128,15 +274,34 @@ class QualificationList(generics.GenericAPIView):
 
     def get(self, request: HttpRequest):
         try:
-            rows = fetch_all("SELECT * FROM get_qualifications()", [])
-            serializer = self.get_serializer(rows, many=True)
-            return Response(serializer.data or [], status=status.HTTP_200_OK)
+            return _reference_response(
+                request,
+                "qualifications",
+                reference_data.qualifications,
+                self.get_serializer,
+            )
         except Exception as e:
             return Response(
                 {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
 
+class ReloadReferenceData(generics.GenericAPIView):
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return []
+
+    def post(self, request: HttpRequest):
+        # Reloads this worker only; other workers pick the change up within REFERENCE_DATA["TTL"].
+        version = reference_data.reload()
+        return Response(
+            {"message": "Reference data reloaded", "version": version},
+            status=status.HTTP_200_OK,
+        )
+
+
 class DoctoreList(generics.GenericAPIView):
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
@@ -158,6 +323,27 @@ class DoctoreList(generics.GenericAPIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+class DoctorProfileCacheStats(generics.GenericAPIView):
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return []
+
+    def get(self, request: HttpRequest):
+        return Response(profile_cache.stats(), status=status.HTTP_200_OK)
+
+
+class DoctorDirectory(generics.GenericAPIView):
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    serializer_class = DoctorDirectorySerializer
+
+    def get(self, request: HttpRequest):
+        res: Response = doctor_directory(self, request)
+        return res
+
+
 class UpdateDoctor(generics.GenericAPIView):
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
@@ -173,7 +359,7 @@ class UpdateDoctor(generics.GenericAPIView):
 
             result = fetch_one(
                 """
-                SELECT update_doctor_profile(%s,%s,%s,%s,%s,%s,%s,%s)
+                SELECT update_doctor_profile(%s,%s,%s,%s,%s,%s,%s,%s,%s)
                 """,
                 [
                     doctor_id,
@@ -188,6 +374,10 @@ class UpdateDoctor(generics.GenericAPIView):
                 ],
             )
 
+            # Also on failure: a doctor that is gone or inactive must not be
+            # served from the cache either.
+            profile_cache.invalidate(doctor_id)
+
             if not result["update_doctor_profile"]:
                 return Response(
                     {"error": "Doctor not found or update failed"},
@@ -204,3 +394,73 @@ class UpdateDoctor(generics.GenericAPIView):
                 {"error": str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
+
+
+class DoctorSchedule(generics.GenericAPIView):
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    serializer_class = DoctorScheduleSerializer
+
+    def get(self, request: HttpRequest, doctor_id: int):
+        res: Response = get_schedule(self, request, doctor_id)
+        return res
+
+    def put(self, request: HttpRequest, doctor_id: int):
+        res: Response = replace_schedule(self, request, doctor_id)
+        return res
+
+
+class DoctorScheduleExceptions(generics.GenericAPIView):
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    serializer_class = ScheduleExceptionSerializer
+
+    def post(self, request: HttpRequest, doctor_id: int):
+        res: Response = add_exception(self, request, doctor_id)
+        return res
+
+
+class DeleteDoctorScheduleException(generics.GenericAPIView):
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return []
+
+    def delete(self, request: HttpRequest, doctor_id: int, exception_id: int):
+        res: Response = delete_exception(self, request, doctor_id, exception_id)
+        return res
+
+
+class DoctorAvailability(generics.GenericAPIView):
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return []
+
+    def get(self, request: HttpRequest):
+        res: Response = doctor_availability(self, request)
+        return res
+
+
+class BookAppointment(generics.GenericAPIView):
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    serializer_class = BookAppointmentSerializer
+
+    def post(self, request: HttpRequest, doctor_id: int):
+        res: Response = book_appointment(self, request, doctor_id)
+        return res
+
+
+class CancelAppointment(generics.GenericAPIView):
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return []
+
+    def post(self, request: HttpRequest, appointment_id: int):
+        res: Response = cancel_appointment(self, request, appointment_id)
+        return res
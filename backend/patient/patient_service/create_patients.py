@@ -6,6 +6,9 @@ from django.http import HttpRequest
 
 from .db import fetch_one
 from service_app.image_process import get_image_path
+from .entity_cache import patient_cache
+from .list_cache import list_cache
+from .suggest_patients import name_index
 
 
 def create_patient(self, request: HttpRequest):
@@ -37,6 +40,9 @@ def create_patient(self, request: HttpRequest):
         )
 
     patient_id = result["create_patient"]
+    name_index.add(patient_id, data["patient_name"])
+    list_cache.invalidate()
+    patient_cache.invalidate(patient_id)
 
     return Response(
         {"message": "Patient created successfully", "patient_id": patient_id},
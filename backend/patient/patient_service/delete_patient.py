@@ -3,6 +3,9 @@ from rest_framework import status
 from rest_framework.response import Response
 
 from .db import fetch_one
+from .entity_cache import patient_cache
+from .list_cache import list_cache
+from .suggest_patients import name_index
 
 
 def delete(patient_id: int, data):
@@ -19,6 +22,10 @@ def delete(patient_id: int, data):
             status=status.HTTP_404_NOT_FOUND,
         )
 
+    name_index.remove(patient_id)
+    list_cache.invalidate()
+    patient_cache.invalidate(patient_id)
+
     return Response(
         {
             "message": "Patient deleted successfully",
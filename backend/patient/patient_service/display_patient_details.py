@@ -2,11 +2,52 @@
 from rest_framework import status
 from rest_framework.response import Response
 
+from service_app.conditional import (
+    is_conditional,
+    make_validators,
+    not_modified_response,
+    set_validators,
+)
 from .db import fetch_one
+from .entity_cache import patient_cache
+
+
+def _etag_of(patient_id, patient):
+    version = patient["updated_at"] or patient["created_at"]
+    if version is None:
+        return None, None
+    return make_validators("patient", patient_id, version)
+
 
 def display_patient_details(self, patient_id: int):
-    patient = fetch_one("SELECT * FROM display_single_patient(%s);", [patient_id])
-    if patient == 0:
+    request = self.request
+
+    # Revalidation only needs the version timestamp, not the full row.
+    probe_etag = None
+    if is_conditional(request):
+        probe = fetch_one("SELECT * FROM patient_version(%s);", [patient_id])
+        if probe is not None and probe["version"] is not None:
+            probe_etag, last_modified = make_validators(
+                "patient", patient_id, probe["version"]
+            )
+            res = not_modified_response(request, probe_etag, last_modified)
+            if res is not None:
+                return set_validators(res, probe_etag, last_modified)
+
+    def loader():
+        return fetch_one("SELECT * FROM display_single_patient(%s);", [patient_id])
+
+    patient = patient_cache.get(patient_id, loader)
+    if (
+        patient is not None
+        and probe_etag is not None
+        and _etag_of(patient_id, patient)[0] != probe_etag
+    ):
+        # The probe saw a newer version than this worker cached.
+        patient_cache.invalidate(patient_id)
+        patient = patient_cache.get(patient_id, loader)
+
+    if patient is None:
         print("Not Found In Database")
         return Response(
             {"error": "Patient not found of this id"},
@@ -15,7 +56,11 @@ def display_patient_details(self, patient_id: int):
 
     serializer = self.get_serializer(patient)
 
-    return Response(
+    response = Response(
         {"data": serializer.data},
         status=status.HTTP_200_OK,
     )
+    etag, last_modified = _etag_of(patient_id, patient)
+    if etag is not None:
+        set_validators(response, etag, last_modified)
+    return response
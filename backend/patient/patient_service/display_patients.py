@@ -1,12 +1,190 @@
 # Hospital_Management\backend\patient\patient_service\display_patients.py
+import base64
+import binascii
+import re
+
 from rest_framework import status
 from rest_framework.response import Response
 from django.http import HttpRequest
 
 from .db import fetch_one, fetch_all
+from .list_cache import list_cache
+
+# Same rule as the mobile validation in doctor/serializers.py.
+MOBILE_RE = re.compile(r"^[6-9]\d{9}$")
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+MOBILE_NOISE_RE = re.compile(r"[\s\-().]")
+# patient_id is INTEGER; longer digit strings cannot be an id.
+MAX_ID_DIGITS = 9
+MAX_FULLTEXT_RESULTS = 50
+
+
+def classify_query(query: str):
+    """
+    Returns (kind, value) for searches that can be answered by an exact
+    index lookup: ("mobile", "9876543210"), ("email", ...), ("id", "42").
+    Returns None when only the substring search applies.
+    """
+    query = query.strip()
+    if not query:
+        return None
+
+    if EMAIL_RE.match(query):
+        return "email", query.lower()
+
+    digits = MOBILE_NOISE_RE.sub("", query)
+    if digits.startswith("+91"):
+        digits = digits[3:]
+    elif len(digits) == 11 and digits.startswith("0"):
+        digits = digits[1:]
+    if MOBILE_RE.match(digits):
+        return "mobile", digits
+
+    if query.isdecimal() and len(query) <= MAX_ID_DIGITS:
+        return "id", str(int(query))
+
+    return None
+
+
+def encode_cursor(direction: str, patient_id: int) -> str:
+    raw = f"{direction}:{patient_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """Returns ("a" | "b", patient_id), or None for a malformed cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        direction, value = base64.urlsafe_b64decode(padded).decode().split(":", 1)
+        patient_id = int(value)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        return None
+    if direction not in ("a", "b") or patient_id < 0:
+        return None
+    return direction, patient_id
+
+
+def _count_patients(query, category):
+    total_res = fetch_one(
+        "select * from count_display_patients(%s, %s);", [query, category]
+    )
+    return total_res["count_display_patients"] if total_res else 0
+
+
+def _cursor_page(patients, page_size, direction, patient_id):
+    """
+    Trims rows fetched past a cursor (up to page_size + 1, in walking
+    order) to one page in patient_id order. Returns (rows, next, prev).
+    """
+    has_more = len(patients) > page_size
+    patients = patients[:page_size]
+
+    next_cursor = prev_cursor = None
+    if direction == "b":
+        patients.reverse()
+        if patients:
+            next_cursor = encode_cursor("a", patients[-1]["patient_id"])
+            if has_more:
+                prev_cursor = encode_cursor("b", patients[0]["patient_id"])
+    elif patients:
+        if has_more:
+            next_cursor = encode_cursor("a", patients[-1]["patient_id"])
+        if patient_id:
+            prev_cursor = encode_cursor("b", patients[0]["patient_id"])
+    return patients, next_cursor, prev_cursor
+
+
+def _keyset_page(self, query, category, page_size, direction, patient_id):
+    after = patient_id if direction == "a" else None
+    before = patient_id if direction == "b" else None
+
+    # One extra row tells us whether another page exists in that direction.
+    patients = fetch_all(
+        "SELECT * from display_patients_keyset(%s, %s, %s, %s, %s);",
+        [query, category, after, before, page_size + 1],
+    )
+    patients, next_cursor, prev_cursor = _cursor_page(
+        patients, page_size, direction, patient_id
+    )
+
+    # No total here: counting the filtered set would scan it on every page,
+    # which is what cursor pagination exists to avoid.
+    serializer = self.get_serializer(patients, many=True)
+    return Response(
+        {
+            "data": serializer.data,
+            "page_size": page_size,
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor,
+        },
+        status=status.HTTP_200_OK,
+    )
+
+
+def _exact_match_page(self, kind, value, category, page, page_size, position):
+    """
+    Answers a classified search from lookup_patients(). Returns None when
+    nothing matched so the caller can fall back to the substring search.
+    The matches are few and come back in patient_id order, so a cursor
+    (position) pages through them in memory.
+    """
+    patients = fetch_all(
+        "SELECT * from lookup_patients(%s, %s, %s);", [kind, value, category]
+    )
+    if not patients:
+        return None
+
+    data = {"count": len(patients), "count_exact": True}
+    if position is not None:
+        direction, patient_id = position
+        if direction == "a":
+            window = [p for p in patients if p["patient_id"] > patient_id]
+        else:
+            window = [p for p in reversed(patients) if p["patient_id"] < patient_id]
+        rows, data["next_cursor"], data["prev_cursor"] = _cursor_page(
+            window[: page_size + 1], page_size, direction, patient_id
+        )
+    else:
+        offset = (page - 1) * page_size
+        rows = patients[offset : offset + page_size]
+        data["page"] = page
+
+    serializer = self.get_serializer(rows, many=True)
+    data.update(data=serializer.data, page_size=page_size, match=kind)
+    return Response(data, status=status.HTTP_200_OK)
+
+
+def _fulltext_page(self, query, category, page_size):
+    limit = min(page_size, MAX_FULLTEXT_RESULTS)
+    patients = fetch_all(
+        "SELECT * from search_patients_fulltext(%s, %s, %s);",
+        [query, category, limit],
+    )
+    serializer = self.get_serializer(patients, many=True)
+    return Response(
+        {
+            "count": len(patients),
+            "data": serializer.data,
+            "page_size": limit,
+            "mode": "fulltext",
+        },
+        status=status.HTTP_200_OK,
+    )
 
 
 def display_patients(self, request: HttpRequest):
+    key = list_cache.key_for(request.query_params)
+    cached = list_cache.get(key)
+    if cached is not None:
+        return Response(cached, status=status.HTTP_200_OK)
+
+    res: Response = _display_patients(self, request)
+    if res.status_code == status.HTTP_200_OK:
+        list_cache.put(key, res.data)
+    return res
+
+
+def _display_patients(self, request: HttpRequest):
     query = request.query_params.get("query", "") or ""
     category: str = request.query_params.get("category", "all") or "all"
     try:
@@ -23,26 +201,53 @@ def display_patients(self, request: HttpRequest):
     except (ValueError, TypeError):
         page_size = 5
 
+    if request.query_params.get("mode") == "fulltext":
+        return _fulltext_page(self, query, category, page_size)
+
+    cursor = request.query_params.get("cursor")
+    after = request.query_params.get("after")
+    position = None
+    if cursor or after is not None:
+        if cursor:
+            position = decode_cursor(cursor)
+        else:
+            position = ("a", int(after)) if after.isdecimal() else None
+        if position is None:
+            return Response(
+                {"error": "Invalid pagination cursor"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+    classified = classify_query(query)
+    if classified:
+        res = _exact_match_page(self, *classified, category, page, page_size, position)
+        if res is not None:
+            return res
+
+    if position is not None:
+        return _keyset_page(self, query, category, page_size, *position)
+
+    exact = (request.query_params.get("exact", "") or "").lower() in ("1", "true", "yes")
     offset = (page - 1) * page_size
 
     patients = fetch_all(
-        "SELECT * from display_patients(%s, %s, %s, %s);",
-        [query, category, page_size, offset],
+        "SELECT * from display_patients_page(%s, %s, %s, %s, %s);",
+        [query, category, page_size, offset, exact],
     )
 
-    total_res = fetch_one(
-        "select * from count_display_patients(%s, %s);", [query, category]
-    )
-    total_count = 0
-    if isinstance(total_res, dict):
-        total_count = list(total_res.values())[0] if total_res else 0
+    if patients:
+        total_count = patients[0]["total_count"]
+        count_exact = patients[0]["total_exact"]
     else:
-        total_count = total_res or 0
+        # Past the last page the window count has no row to ride on.
+        total_count = _count_patients(query, category) if offset else 0
+        count_exact = True
 
     serializer = self.get_serializer(patients, many=True)
     return Response(
         {
             "count": total_count,
+            "count_exact": count_exact,
             "data": serializer.data,
             "page": page,
             "page_size": page_size,
@@ -0,0 +1,58 @@
+# Hospital_Management\backend\patient\patient_service\display_patients_batch.py
+from django.conf import settings
+from django.http import HttpRequest
+from rest_framework import status
+from rest_framework.response import Response
+
+from .db import fetch_all
+from .entity_cache import patient_cache
+
+
+def _load_patients(patient_ids):
+    rows = fetch_all(
+        "SELECT * FROM display_patients_by_ids(%s);", [list(patient_ids)]
+    )
+    return {row["patient_id"]: row for row in rows}
+
+
+def display_patients_batch(self, request: HttpRequest):
+    max_ids = getattr(settings, "PATIENT_BATCH_MAX_IDS", 100)
+    raw_ids = request.query_params.get("ids", "") or ""
+
+    patient_ids = []
+    seen = set()
+    for part in raw_ids.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if not part.isdecimal():
+            return Response(
+                {"error": f"Invalid patient id: {part}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        patient_id = int(part)
+        if patient_id not in seen:
+            seen.add(patient_id)
+            patient_ids.append(patient_id)
+
+    if not patient_ids:
+        return Response(
+            {"error": "ids query parameter is required"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if len(patient_ids) > max_ids:
+        return Response(
+            {"error": f"At most {max_ids} ids can be requested at once"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    found = patient_cache.get_many(patient_ids, _load_patients)
+
+    patients = [found[pid] for pid in patient_ids if pid in found]
+    missing = [pid for pid in patient_ids if pid not in found]
+
+    serializer = self.get_serializer(patients, many=True)
+    return Response(
+        {"data": serializer.data, "missing": missing},
+        status=status.HTTP_200_OK,
+    )
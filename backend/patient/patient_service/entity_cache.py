@@ -0,0 +1,142 @@
+# Hospital_Management\backend\patient\patient_service\entity_cache.py
+import sys
+import threading
+
+from cachetools import TTLCache
+from django.conf import settings
+
+
+def _record_size(row):
+    values = row.as_tuple()
+    return sys.getsizeof(values) + sum(sys.getsizeof(v) for v in values)
+
+
+class _CountingTTLCache(TTLCache):
+    def __init__(self, maxsize, ttl, getsizeof=None):
+        super().__init__(maxsize, ttl, getsizeof=getsizeof)
+        self.evictions = 0
+
+    def popitem(self):
+        # Only called when the byte budget is full; TTL expiry does not go through here.
+        item = super().popitem()
+        self.evictions += 1
+        return item
+
+
+class PatientEntityCache:
+    """
+    Read-through cache of single patient rows keyed by patient_id, bounded
+    by an approximate byte budget (LRU eviction) and a TTL, so writes made
+    by other worker processes are picked up once an entry expires. Rows are
+    kept as the data layer's Row records, so each entry is one tuple plus a
+    column map shared with every other row. Unknown ids are remembered for
+    a short TTL so repeated 404 probes do not reach Postgres.
+    """
+
+    def __init__(self, max_bytes, ttl, negative_ttl, negative_maxsize):
+        self._records = _CountingTTLCache(max_bytes, ttl, getsizeof=_record_size)
+        self._missing = TTLCache(negative_maxsize, negative_ttl)
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; a load that overlapped a write is not stored.
+        self._writes = 0
+        self._hits = 0
+        self._negative_hits = 0
+        self._misses = 0
+
+    def get(self, patient_id, loader):
+        with self._lock:
+            row = self._records.get(patient_id)
+            if row is not None:
+                self._hits += 1
+                return row
+            if patient_id in self._missing:
+                self._negative_hits += 1
+                return None
+            self._misses += 1
+            writes = self._writes
+
+        row = loader()
+
+        with self._lock:
+            if writes != self._writes:
+                return row
+            if row is None:
+                self._missing[patient_id] = True
+            elif _record_size(row) <= self._records.maxsize:
+                self._records[patient_id] = row
+        return row
+
+    def get_many(self, patient_ids, loader):
+        """
+        Like get() for several ids; loader(missing_ids) must return a
+        {patient_id: row} dict for the ids it found. Returns the same shape.
+        """
+        found = {}
+        missing = []
+        with self._lock:
+            for patient_id in patient_ids:
+                row = self._records.get(patient_id)
+                if row is not None:
+                    self._hits += 1
+                    found[patient_id] = row
+                elif patient_id in self._missing:
+                    self._negative_hits += 1
+                else:
+                    self._misses += 1
+                    missing.append(patient_id)
+            writes = self._writes
+
+        if not missing:
+            return found
+
+        loaded = loader(missing)
+        found.update(loaded)
+
+        with self._lock:
+            if writes == self._writes:
+                for patient_id in missing:
+                    row = loaded.get(patient_id)
+                    if row is None:
+                        self._missing[patient_id] = True
+                    elif _record_size(row) <= self._records.maxsize:
+                        self._records[patient_id] = row
+        return found
+
+    def invalidate(self, patient_id):
+        with self._lock:
+            self._writes += 1
+            self._records.pop(patient_id, None)
+            self._missing.pop(patient_id, None)
+
+    def clear_negative(self):
+        """Forget remembered misses, e.g. after a bulk insert of unknown ids."""
+        with self._lock:
+            self._writes += 1
+            self._missing.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._negative_hits + self._misses
+            return {
+                "hits": self._hits,
+                "negative_hits": self._negative_hits,
+                "misses": self._misses,
+                "hit_ratio": (
+                    (self._hits + self._negative_hits) / lookups if lookups else 0.0
+                ),
+                "evictions": self._records.evictions,
+                "entries": len(self._records),
+                "bytes": self._records.currsize,
+                "max_bytes": self._records.maxsize,
+                "ttl": self._records.ttl,
+                "negative_entries": len(self._missing),
+            }
+
+
+_conf = getattr(settings, "PATIENT_ENTITY_CACHE", {})
+patient_cache = PatientEntityCache(
+    _conf.get("MAX_BYTES", 4 * 1024 * 1024),
+    _conf.get("TTL", 60),
+    _conf.get("NEGATIVE_TTL", 30),
+    _conf.get("NEGATIVE_MAXSIZE", 10000),
+)
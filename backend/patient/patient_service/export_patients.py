@@ -0,0 +1,89 @@
+# Hospital_Management\backend\patient\patient_service\export_patients.py
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpRequest, StreamingHttpResponse
+from rest_framework import status
+from rest_framework.response import Response
+
+from .db import fetch_iter
+from .display_patients import classify_query
+
+EXPORT_COLUMNS = [
+    "patient_id",
+    "patient_name",
+    "dob",
+    "email",
+    "mobile",
+    "gender",
+    "blood_group",
+    "address",
+    "status",
+    "created_at",
+    "created_by",
+    "updated_at",
+    "updated_by",
+]
+
+# Rows joined into one chunk before handing it to the WSGI server.
+CHUNK_ROWS = 500
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def _chunked(lines):
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= CHUNK_ROWS:
+            yield "".join(buffer)
+            buffer = []
+    if buffer:
+        yield "".join(buffer)
+
+
+def _csv_lines(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def _ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_COLUMNS, row)), cls=DjangoJSONEncoder) + "\n"
+
+
+def export_patients(self, request: HttpRequest):
+    query = request.query_params.get("query", "") or ""
+    category: str = request.query_params.get("category", "all") or "all"
+    output = (request.query_params.get("output", "csv") or "csv").lower()
+
+    if output not in ("csv", "ndjson"):
+        return Response(
+            {"error": "output must be 'csv' or 'ndjson'"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    # Classified the same way as the list, so both return the same rows.
+    kind, value = classify_query(query) or (None, None)
+    rows = fetch_iter(
+        "SELECT * FROM export_patients(%s, %s, %s, %s)",
+        [query, category, kind, value],
+        raw=True,
+    )
+
+    if output == "ndjson":
+        lines = _ndjson_lines(rows)
+        content_type = "application/x-ndjson"
+    else:
+        lines = _csv_lines(rows)
+        content_type = "text/csv"
+
+    response = StreamingHttpResponse(_chunked(lines), content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="patients.{output}"'
+    return response
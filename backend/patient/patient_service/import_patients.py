@@ -0,0 +1,209 @@
+# Hospital_Management\backend\patient\patient_service\import_patients.py
+import csv
+import io
+import json
+
+from django.conf import settings
+from django.http import HttpRequest
+from rest_framework import serializers, status
+from rest_framework.response import Response
+
+from .db import transaction
+from .entity_cache import patient_cache
+from .list_cache import list_cache
+from .serializers import PatientImportSerializer
+from .suggest_patients import name_index
+
+# Column order of the patient_import_staging table created by begin_patient_import().
+STAGING_COLUMNS = (
+    "row_no",
+    "patient_name",
+    "dob",
+    "email",
+    "mobile",
+    "gender",
+    "blood_group",
+    "address",
+    "created_by",
+)
+COPY_SQL = "COPY patient_import_staging ({}) FROM STDIN WITH (FORMAT csv)".format(
+    ", ".join(STAGING_COLUMNS)
+)
+INPUT_FORMATS = ("csv", "ndjson")
+
+
+class _UnreadableFile(Exception):
+    """Raised inside the import transaction so nothing staged before it is kept."""
+
+    def __init__(self, row_no, error):
+        super().__init__(error)
+        self.row_no = row_no
+        self.error = error
+
+
+def _input_format(request, upload):
+    requested = (request.query_params.get("input") or "").lower()
+    if requested:
+        return requested if requested in INPUT_FORMATS else None
+    name = (upload.name or "").lower()
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    if name.endswith(".csv"):
+        return "csv"
+    return None
+
+
+def _csv_rows(upload):
+    """Yields (row_no, dict or error). Empty cells count as missing fields."""
+    text = io.TextIOWrapper(upload, encoding="utf-8-sig", newline="")
+    try:
+        for row_no, row in enumerate(csv.DictReader(text), start=1):
+            yield row_no, {
+                key.strip(): value
+                for key, value in row.items()
+                if key and value not in (None, "")
+            }
+    except (UnicodeDecodeError, csv.Error) as e:
+        yield None, f"Unreadable CSV: {e}"
+    finally:
+        text.detach()
+
+
+def _ndjson_rows(upload):
+    row_no = 0
+    for line in upload:
+        line = line.strip()
+        if not line:
+            continue
+        row_no += 1
+        try:
+            row = json.loads(line)
+        except (UnicodeDecodeError, ValueError):
+            yield row_no, "Invalid JSON"
+            continue
+        if not isinstance(row, dict):
+            yield row_no, "Each line must be a JSON object"
+            continue
+        yield row_no, row
+
+
+def _flatten_errors(detail):
+    if isinstance(detail, dict):
+        return {field: [str(msg) for msg in msgs] for field, msgs in detail.items()}
+    return [str(msg) for msg in detail]
+
+
+def import_patients(self, request: HttpRequest):
+    upload = request.FILES.get("file")
+    if upload is None:
+        return Response(
+            {"error": "file is required"}, status=status.HTTP_400_BAD_REQUEST
+        )
+
+    input_format = _input_format(request, upload)
+    if input_format is None:
+        return Response(
+            {"error": "input must be one of: csv, ndjson"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    conf = getattr(settings, "PATIENT_IMPORT", {})
+    chunk_rows = conf.get("COPY_CHUNK_ROWS", 5000)
+    max_errors = conf.get("MAX_ERRORS", 1000)
+
+    rows = _csv_rows(upload) if input_format == "csv" else _ndjson_rows(upload)
+    validator = PatientImportSerializer()
+    created_by = request.user.user_id
+
+    errors = []
+    error_count = 0
+    total = 0
+    staged = 0
+
+    def reject(row_no, error):
+        nonlocal error_count
+        error_count += 1
+        if len(errors) < max_errors:
+            errors.append({"row": row_no, "error": error})
+
+    try:
+        with transaction() as cursor:
+            cursor.execute("SELECT begin_patient_import();")
+
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            pending = 0
+
+            def flush():
+                buffer.seek(0)
+                cursor.copy_expert(COPY_SQL, buffer)
+                buffer.seek(0)
+                buffer.truncate()
+
+            for row_no, row in rows:
+                if row_no is None:
+                    # The file could not be read past this point; roll back
+                    # instead of committing the rows staged before it.
+                    raise _UnreadableFile(total + 1, row)
+                total += 1
+                if isinstance(row, str):
+                    reject(row_no, row)
+                    continue
+                try:
+                    data = validator.run_validation(row)
+                except serializers.ValidationError as e:
+                    reject(row_no, _flatten_errors(e.detail))
+                    continue
+
+                writer.writerow(
+                    [
+                        row_no,
+                        data["patient_name"],
+                        data["dob"].isoformat(),
+                        data["email"],
+                        data.get("mobile") or None,
+                        data["gender"],
+                        data.get("blood_group") or None,
+                        data.get("address") or None,
+                        data.get("created_by", created_by),
+                    ]
+                )
+                pending += 1
+                if pending >= chunk_rows:
+                    flush()
+                    staged += pending
+                    pending = 0
+
+            if pending:
+                flush()
+                staged += pending
+
+            cursor.execute("SELECT row_no, error FROM merge_patient_import();")
+            duplicates = cursor.fetchall()
+    except _UnreadableFile as e:
+        return Response(
+            {"error": e.error, "row": e.row_no, "inserted": 0},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    for row_no, error in duplicates:
+        reject(row_no, error)
+    errors.sort(key=lambda e: e["row"])
+
+    inserted = staged - len(duplicates)
+    if inserted:
+        list_cache.invalidate()
+        patient_cache.clear_negative()
+        name_index.mark_stale()
+
+    return Response(
+        {
+            "message": "Import finished",
+            "total_rows": total,
+            "inserted": inserted,
+            "rejected": error_count,
+            "errors": errors,
+            "errors_truncated": error_count > len(errors),
+        },
+        status=status.HTTP_200_OK,
+    )
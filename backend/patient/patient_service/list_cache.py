@@ -0,0 +1,79 @@
+# Hospital_Management\backend\patient\patient_service\list_cache.py
+import threading
+
+from cachetools import TTLCache
+from django.conf import settings
+
+# Query parameters that change what /patients/display/ returns.
+KEY_PARAMS = ("query", "category", "page", "page_size", "cursor", "after", "exact", "mode")
+
+
+class _CountingTTLCache(TTLCache):
+    def __init__(self, maxsize, ttl):
+        super().__init__(maxsize, ttl)
+        self.evictions = 0
+
+    def popitem(self):
+        # Only called when the cache is full; TTL expiry does not go through here.
+        item = super().popitem()
+        self.evictions += 1
+        return item
+
+
+class PatientListCache:
+    """
+    LRU + TTL cache of serialized patient list responses. Every key carries
+    the current generation; a write to patients bumps the generation so
+    entries cached before it can never be served again.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self._cache = _CountingTTLCache(maxsize, ttl)
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def key_for(self, query_params):
+        with self._lock:
+            generation = self._generation
+        return (generation,) + tuple(query_params.get(name) for name in KEY_PARAMS)
+
+    def get(self, key):
+        with self._lock:
+            value = self._cache.get(key)
+            if value is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            if key[0] == self._generation:
+                self._cache[key] = value
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._invalidations += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+                "evictions": self._cache.evictions,
+                "invalidations": self._invalidations,
+                "generation": self._generation,
+                "size": len(self._cache),
+                "maxsize": self._cache.maxsize,
+                "ttl": self._cache.ttl,
+            }
+
+
+_conf = getattr(settings, "PATIENT_LIST_CACHE", {})
+list_cache = PatientListCache(_conf.get("MAXSIZE", 512), _conf.get("TTL", 30))
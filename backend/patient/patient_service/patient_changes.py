@@ -0,0 +1,86 @@
+# Hospital_Management\backend\patient\patient_service\patient_changes.py
+import base64
+import binascii
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.http import HttpRequest
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.response import Response
+
+from .db import fetch_all
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 5000
+
+
+def encode_change_cursor(changed_at: datetime, patient_id: int) -> str:
+    micros = (changed_at - EPOCH) // timedelta(microseconds=1)
+    raw = f"{micros}:{patient_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_change_cursor(cursor: str):
+    """
+    Accepts a cursor from a previous response, or an ISO-8601 timestamp
+    for the first sync. Returns (changed_at, patient_id) or None.
+    """
+    try:
+        since = parse_datetime(cursor)
+    except ValueError:
+        since = None
+    if since is not None:
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return since, 0
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        micros, patient_id = base64.urlsafe_b64decode(padded).decode().split(":", 1)
+        return EPOCH + timedelta(microseconds=int(micros)), int(patient_id)
+    except (ValueError, binascii.Error, UnicodeDecodeError, OverflowError):
+        return None
+
+
+def patient_changes(self, request: HttpRequest):
+    cursor = request.query_params.get("since", "") or ""
+    try:
+        limit = int(request.query_params.get("limit", DEFAULT_LIMIT))
+    except (ValueError, TypeError):
+        limit = DEFAULT_LIMIT
+    limit = max(1, min(limit, MAX_LIMIT))
+
+    if cursor:
+        position = decode_change_cursor(cursor)
+        if position is None:
+            return Response(
+                {"error": "Invalid since cursor"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+    else:
+        position = (EPOCH, 0)
+
+    lag = getattr(settings, "PATIENT_CHANGES_LAG_SECONDS", 5)
+    rows = fetch_all(
+        "SELECT * FROM patient_changes(%s, %s, %s, %s);",
+        [position[0], position[1], lag, limit + 1],
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    if rows:
+        next_cursor = encode_change_cursor(rows[-1]["changed_at"], rows[-1]["patient_id"])
+    else:
+        next_cursor = encode_change_cursor(*position)
+
+    serializer = self.get_serializer(rows, many=True)
+    return Response(
+        {
+            "data": serializer.data,
+            "next_cursor": next_cursor,
+            "has_more": has_more,
+        },
+        status=status.HTTP_200_OK,
+    )
@@ -17,6 +17,17 @@ class PatientInsertSerializer(serializers.Serializer):
     created_by = serializers.IntegerField()
 
 
+class PatientImportSerializer(PatientInsertSerializer):
+    """One row of a bulk import file; column widths match the patients table."""
+
+    email = serializers.EmailField(max_length=100)
+    blood_group = serializers.CharField(
+        max_length=5, required=False, allow_null=True, allow_blank=True
+    )
+    profile_image = None
+    created_by = serializers.IntegerField(required=False)
+
+
 class PatientListSerializer(serializers.Serializer):
     patient_id = serializers.IntegerField()
     patient_name = serializers.CharField()
@@ -72,3 +83,19 @@ class PatientSetPagination(PageNumberPagination):
     page_size = 5
     page_size_query_param = "page_size"
     max_page_size = 15
+
+
+class PatientChangeSerializer(serializers.Serializer):
+    patient_id = serializers.IntegerField()
+    patient_name = serializers.CharField()
+    dob = serializers.DateField(allow_null=True)
+    email = serializers.EmailField(allow_null=True)
+    mobile = serializers.CharField(allow_null=True)
+    gender = serializers.ChoiceField(choices=["M", "F"])
+    blood_group = serializers.CharField(allow_null=True)
+    address = serializers.CharField(allow_null=True)
+    status = serializers.ChoiceField(choices=["A", "D"])
+    created_at = serializers.DateTimeField(allow_null=True)
+    updated_at = serializers.DateTimeField(allow_null=True)
+    changed_at = serializers.DateTimeField()
+    change_type = serializers.ChoiceField(choices=["created", "updated", "deleted"])
@@ -0,0 +1,175 @@
+# Hospital_Management\backend\patient\patient_service\suggest_patients.py
+import threading
+import time
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django.http import HttpRequest
+from rest_framework import status
+from rest_framework.response import Response
+
+from .db import fetch_iter
+
+DEFAULT_SUGGESTIONS = 10
+MAX_SUGGESTIONS = 25
+
+
+def _index_keys(name: str):
+    """A name is findable from its start and from the start of each later word."""
+    words = name.lower().split()
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+class PatientNameIndex:
+    """
+    In-process sorted prefix index over active patient names. Lookups are a
+    bisect into a sorted list of (key, patient_id) pairs. Writes from this
+    process are applied incrementally; a periodic rebuild picks up writes
+    made by other worker processes. Writes made while a rebuild is reading
+    are recorded and replayed onto the new index before it is swapped in.
+    """
+
+    def __init__(self, refresh_seconds):
+        self.refresh_seconds = refresh_seconds
+        self._keys = []
+        self._names = {}
+        self._loaded_at = None
+        self._lock = threading.RLock()
+        self._loading = threading.Lock()
+        # (patient_id, name or None for a removal) seen during a rebuild.
+        self._pending = None
+        self._stale_during_load = False
+
+    def _build(self):
+        keys = []
+        names = {}
+        for patient_id, patient_name in fetch_iter(
+            "SELECT * FROM get_active_patient_names()", [], raw=True
+        ):
+            names[patient_id] = patient_name
+            keys.extend((key, patient_id) for key in _index_keys(patient_name))
+        keys.sort()
+        return keys, names
+
+    def load(self):
+        with self._lock:
+            self._pending = []
+            self._stale_during_load = False
+        try:
+            keys, names = self._build()
+        except Exception:
+            with self._lock:
+                self._pending = None
+            raise
+
+        with self._lock:
+            self._keys = keys
+            self._names = names
+            for patient_id, patient_name in self._pending:
+                if patient_name is None:
+                    self._remove_locked(patient_id)
+                else:
+                    self._add_locked(patient_id, patient_name)
+            self._pending = None
+            self._loaded_at = time.monotonic()
+            if self._stale_during_load:
+                # A bulk write may have committed after the rebuild read.
+                self._loaded_at -= self.refresh_seconds + 1
+
+    def _ensure_fresh(self):
+        if self._loaded_at is None:
+            with self._loading:
+                if self._loaded_at is None:
+                    self.load()
+            return
+
+        stale = time.monotonic() - self._loaded_at > self.refresh_seconds
+        # Only one request pays for a rebuild; the rest keep reading the old index.
+        if stale and self._loading.acquire(blocking=False):
+            try:
+                self.load()
+            except Exception:
+                # Keep serving the current index; the next lookup retries.
+                pass
+            finally:
+                self._loading.release()
+
+    def mark_stale(self):
+        """Rebuild on the next lookup; cheaper than add() for bulk writes."""
+        with self._lock:
+            if self._pending is not None:
+                self._stale_during_load = True
+            if self._loaded_at is not None:
+                self._loaded_at -= self.refresh_seconds + 1
+
+    def add(self, patient_id: int, patient_name: str):
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((patient_id, patient_name))
+            if self._loaded_at is None:
+                return
+            self._add_locked(patient_id, patient_name)
+
+    def remove(self, patient_id: int):
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((patient_id, None))
+            if self._loaded_at is None:
+                return
+            self._remove_locked(patient_id)
+
+    def _add_locked(self, patient_id, patient_name):
+        self._remove_locked(patient_id)
+        self._names[patient_id] = patient_name
+        for key in _index_keys(patient_name):
+            insort(self._keys, (key, patient_id))
+
+    def _remove_locked(self, patient_id):
+        old_name = self._names.pop(patient_id, None)
+        if old_name is None:
+            return
+        for key in _index_keys(old_name):
+            i = bisect_left(self._keys, (key, patient_id))
+            if i < len(self._keys) and self._keys[i] == (key, patient_id):
+                del self._keys[i]
+
+    def suggest(self, prefix: str, limit: int):
+        self._ensure_fresh()
+        prefix = " ".join(prefix.lower().split())
+        if not prefix:
+            return []
+
+        results = []
+        seen = set()
+        with self._lock:
+            i = bisect_left(self._keys, (prefix,))
+            while i < len(self._keys) and len(results) < limit:
+                key, patient_id = self._keys[i]
+                if not key.startswith(prefix):
+                    break
+                if patient_id not in seen:
+                    seen.add(patient_id)
+                    results.append(
+                        {"patient_id": patient_id, "patient_name": self._names[patient_id]}
+                    )
+                i += 1
+        return results
+
+
+name_index = PatientNameIndex(
+    getattr(settings, "PATIENT_SUGGEST_REFRESH_SECONDS", 600)
+)
+
+
+def suggest_patients(self, request: HttpRequest):
+    prefix = request.query_params.get("q", "") or ""
+    try:
+        limit = int(request.query_params.get("limit", DEFAULT_SUGGESTIONS))
+    except (ValueError, TypeError):
+        limit = DEFAULT_SUGGESTIONS
+    limit = max(1, min(limit, MAX_SUGGESTIONS))
+
+    return Response(
+        {"data": name_index.suggest(prefix, limit)},
+        status=status.HTTP_200_OK,
+    )
@@ -5,6 +5,9 @@ from rest_framework.response import Response
 
 from service_app.image_process import get_image_path
 from .db import fetch_one
+from .entity_cache import patient_cache
+from .list_cache import list_cache
+from .suggest_patients import name_index
 
 
 def update_patient(self, request: HttpRequest, patient_id: int):
@@ -45,6 +48,10 @@ def update_patient(self, request: HttpRequest, patient_id: int):
             status=status.HTTP_400_BAD_REQUEST,
         )
 
+    name_index.add(patient_id, data["patient_name"])
+    list_cache.invalidate()
+    patient_cache.invalidate(patient_id)
+
     return Response(
         {"message": "Patient updated successfully", "patient_id": status_code},
         status=status.HTTP_200_OK,
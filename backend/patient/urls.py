@@ -2,9 +2,15 @@ from django.urls import path
 from .views import (
     DeletePatient,
     DisplayPatientDetails,
+    DisplayPatientsBatch,
     UpdatePatient,
     DisplayPatients,
     AddPatient,
+    ExportPatients,
+    ImportPatients,
+    SuggestPatients,
+    PatientChanges,
+    PatientCacheStats,
 )
 from django.conf import settings
 from django.conf.urls.static import static
@@ -12,6 +18,16 @@ from django.conf.urls.static import static
 urlpatterns = [
     path("add/", AddPatient.as_view(), name="add_patient"),
     path("display/", DisplayPatients.as_view(), name="display_patient"),
+    path("export/", ExportPatients.as_view(), name="export_patients"),
+    path("import/", ImportPatients.as_view(), name="import_patients"),
+    path("suggest/", SuggestPatients.as_view(), name="suggest_patients"),
+    path("changes/", PatientChanges.as_view(), name="patient_changes"),
+    path("cache/stats/", PatientCacheStats.as_view(), name="patient_cache_stats"),
+    path(
+        "display/batch/",
+        DisplayPatientsBatch.as_view(),
+        name="display_patients_batch",
+    ),
     path(
         "display/<int:patient_id>",
         DisplayPatientDetails.as_view(),
@@ -2,6 +2,7 @@
 from django.http import HttpRequest
 from rest_framework import generics, status
 from rest_framework.response import Response
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from users.authentication import JWTAuthentication
 from .patient_service.serializers import (
@@ -9,6 +10,7 @@ from .patient_service.serializers import (
     PatientDisplaySerializer,
     PatientUpdateSerializer,
     PatientListSerializer,
+    PatientChangeSerializer,
     DeleteSerializer,
 )
 from .patient_service.db import fetch_one, fetch_all
@@ -20,8 +22,15 @@ from service_app.image_process import get_image_path
 from .patient_service.create_patients import create_patient
 from .patient_service.display_patients import display_patients
 from .patient_service.display_patient_details import display_patient_details
+from .patient_service.display_patients_batch import display_patients_batch
 from .patient_service.update_patient import update_patient
 from .patient_service.delete_patient import delete
+from .patient_service.export_patients import export_patients
+from .patient_service.import_patients import import_patients
+from .patient_service.suggest_patients import suggest_patients
+from .patient_service.patient_changes import patient_changes
+from .patient_service.list_cache import list_cache
+from .patient_service.entity_cache import patient_cache
 
 
 class AddPatient(generics.GenericAPIView):
@@ -52,6 +61,57 @@ class DisplayPatients(generics.GenericAPIView):
         return res
 
 
+class ExportPatients(generics.GenericAPIView):
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return []
+
+    def get(self, request):
+        res = export_patients(self, request)
+        return res
+
+
+class ImportPatients(generics.GenericAPIView):
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    def get_queryset(self):
+        return []
+
+    def post(self, request):
+        res: Response = import_patients(self, request)
+        return res
+
+
+class PatientChanges(generics.GenericAPIView):
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return []
+
+    serializer_class = PatientChangeSerializer
+
+    def get(self, request):
+        res: Response = patient_changes(self, request)
+        return res
+
+
+class SuggestPatients(generics.GenericAPIView):
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return []
+
+    def get(self, request):
+        res: Response = suggest_patients(self, request)
+        return res
+
+
 class DisplayPatientDetails(generics.GenericAPIView):
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
@@ -66,6 +126,20 @@ class DisplayPatientDetails(generics.GenericAPIView):
         return res
 
 
+class DisplayPatientsBatch(generics.GenericAPIView):
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return []
+
+    serializer_class = PatientDisplaySerializer
+
+    def get(self, request):
+        res: Response = display_patients_batch(self, request)
+        return res
+
+
 class UpdatePatient(generics.GenericAPIView):
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
@@ -99,3 +173,17 @@ class DeletePatient(generics.GenericAPIView):
         print("\n\n")
         res: Response = delete(patient_id, data)
         return res
+
+
+class PatientCacheStats(generics.GenericAPIView):
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return []
+
+    def get(self, request):
+        return Response(
+            {"list": list_cache.stats(), "entity": patient_cache.stats()},
+            status=status.HTTP_200_OK,
+        )
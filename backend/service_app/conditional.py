@@ -0,0 +1,37 @@
+# Hospital_Management/backend/service_app/conditional.py
+import hashlib
+from datetime import datetime, timedelta, timezone
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def make_validators(kind: str, pk: int, version):
+    """
+    Strong ETag and Last-Modified timestamp for one record. `version` is
+    the row's last-change timestamp, so the ETag changes whenever the row
+    (and therefore its serialized form) does.
+    """
+    if version.tzinfo is None:
+        # Pooled sessions run in UTC, so naive TIMESTAMP values are UTC.
+        version = version.replace(tzinfo=timezone.utc)
+    micros = (version - EPOCH) // timedelta(microseconds=1)
+    digest = hashlib.sha1(f"{kind}:{pk}:{micros}".encode()).hexdigest()
+    return quote_etag(digest[:20]), int(version.timestamp())
+
+
+def is_conditional(request) -> bool:
+    return "HTTP_IF_NONE_MATCH" in request.META or "HTTP_IF_MODIFIED_SINCE" in request.META
+
+
+def not_modified_response(request, etag, last_modified):
+    """Returns a 304 response if the client's copy is current, else None."""
+    return get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+
+def set_validators(response, etag, last_modified):
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    return response
@@ -0,0 +1,141 @@
+# Hospital_Management/backend/service_app/db.py
+import itertools
+from collections.abc import Mapping
+from contextlib import contextmanager
+
+from django.conf import settings
+
+from .db_pool import get_pool
+
+
+class Row(Mapping):
+    """
+    Read-only record backed by the row tuple and a column-index map shared
+    by every row of the same statement. Behaves like the dicts the helpers
+    used to return (row["col"], row.get("col"), keys/values/items).
+    """
+
+    __slots__ = ("_values", "_index")
+
+    def __init__(self, values, index):
+        self._values = values
+        self._index = index
+
+    def __getitem__(self, key):
+        return self._values[self._index[key]]
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self._values[self._index[name]]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def as_tuple(self):
+        return self._values
+
+    def __repr__(self):
+        return f"Row({dict(self.items())})"
+
+
+# Column-index maps, cached per statement text.
+_column_cache = {}
+
+
+def _column_index(query, description):
+    names = tuple(col[0] for col in description)
+    index = _column_cache.get(query)
+    if index is None or tuple(index) != names:
+        index = {name: i for i, name in enumerate(names)}
+        _column_cache[query] = index
+    return index
+
+
+def fetch_one(query, params=None):
+    with get_pool().connection() as conn, conn.raw.cursor() as cursor:
+        conn.statements.execute(cursor, query, params)
+        row = cursor.fetchone()
+        if not row:
+            return None
+        return Row(row, _column_index(query, cursor.description))
+
+
+def fetch_all(query, params=None, raw=False):
+    """
+    raw=True skips record wrapping and returns the driver's tuples, for
+    large result sets where the caller knows the column order.
+    """
+    with get_pool().connection() as conn, conn.raw.cursor() as cursor:
+        conn.statements.execute(cursor, query, params)
+        rows = cursor.fetchall()
+        if raw:
+            return rows
+        index = _column_index(query, cursor.description)
+        return [Row(row, index) for row in rows]
+
+
+def execute(query, params=None):
+    with get_pool().connection() as conn, conn.raw.cursor() as cursor:
+        conn.statements.execute(cursor, query, params)
+
+
+_cursor_seq = itertools.count(1)
+
+
+def fetch_iter(query, params=None, itersize=None, raw=False):
+    """
+    Stream rows through a named server-side cursor, fetching `itersize`
+    rows per round trip. The pooled connection is held until the generator
+    is exhausted or closed, so it can be handed straight to
+    StreamingHttpResponse (which closes it when the response finishes).
+    """
+    if itersize is None:
+        itersize = getattr(settings, "DB_STREAM_ITERSIZE", 2000)
+
+    pool = get_pool()
+    conn = pool.getconn()
+    try:
+        # Named cursors live inside a transaction.
+        conn.raw.autocommit = False
+        with conn.raw.cursor(name=f"stream_{next(_cursor_seq)}") as cursor:
+            cursor.itersize = itersize
+            cursor.execute(query, params)
+            index = None
+            for row in cursor:
+                if raw:
+                    yield row
+                    continue
+                if index is None:
+                    index = _column_index(query, cursor.description)
+                yield Row(row, index)
+        conn.raw.commit()
+    finally:
+        pool.putconn(conn)
+
+
+@contextmanager
+def transaction():
+    """
+    Pooled connection inside one transaction; yields a raw psycopg2 cursor
+    (for COPY, temp tables and multi-statement work). Commits on success,
+    rolls back if the block raises.
+    """
+    with get_pool().connection() as conn:
+        conn.raw.autocommit = False
+        try:
+            with conn.raw.cursor() as cursor:
+                yield cursor
+            conn.raw.commit()
+        except Exception:
+            conn.raw.rollback()
+            raise
@@ -0,0 +1,321 @@
+# Hospital_Management/backend/service_app/db_pool.py
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2 import extensions
+from django.conf import settings
+
+from .prepared import StatementCache, statement_stats
+
+
+DEFAULT_POOL_SETTINGS = {
+    "MIN_SIZE": 2,
+    "MAX_SIZE": 20,
+    "TIMEOUT": 10,
+    "MAX_IDLE": 300,
+    "MAX_LIFETIME": 3600,
+    "HEALTH_CHECK_AFTER": 30,
+    "REAP_INTERVAL": 30,
+    "STATEMENT_CACHE_SIZE": 100,
+}
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class PooledConnection:
+    def __init__(self, raw, statement_cache_size=0):
+        self.raw = raw
+        self.statements = StatementCache(statement_cache_size)
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+    @property
+    def closed(self):
+        return self.raw.closed != 0
+
+    def close(self):
+        try:
+            self.raw.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of raw psycopg2 connections shared by the *_service
+    packages. Connections run in autocommit mode, like Django's default.
+    """
+
+    def __init__(self, conn_kwargs, min_size, max_size, timeout, max_idle,
+                 max_lifetime, health_check_after, reap_interval,
+                 statement_cache_size=0):
+        self.conn_kwargs = conn_kwargs
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.health_check_after = health_check_after
+        self.reap_interval = reap_interval
+        self.statement_cache_size = statement_cache_size
+
+        self._idle = deque()
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        self._waiters = 0
+        self._stats = {
+            "connections_opened": 0,
+            "connections_closed": 0,
+            "checkouts": 0,
+            "checkout_time_total_ms": 0.0,
+            "checkout_time_max_ms": 0.0,
+            "waits": 0,
+            "waiters_max": 0,
+            "timeouts": 0,
+            "health_check_failures": 0,
+            "reaped": 0,
+        }
+
+        self._reaper = threading.Thread(
+            target=self._reap_loop, name="db-pool-reaper", daemon=True
+        )
+        self._reaper.start()
+
+    def _connect(self):
+        raw = psycopg2.connect(**self.conn_kwargs)
+        raw.autocommit = True
+        with raw.cursor() as cursor:
+            cursor.execute("SET TIME ZONE %s", ["UTC" if settings.USE_TZ else settings.TIME_ZONE])
+        with self._cond:
+            self._stats["connections_opened"] += 1
+        return PooledConnection(raw, self.statement_cache_size)
+
+    def _discard(self, conn):
+        conn.close()
+        with self._cond:
+            self._size -= 1
+            self._stats["connections_closed"] += 1
+            self._cond.notify()
+
+    def _is_healthy(self, conn):
+        if conn.closed:
+            return False
+        if time.monotonic() - conn.created_at > self.max_lifetime:
+            return False
+        if time.monotonic() - conn.last_used < self.health_check_after:
+            return True
+        try:
+            with conn.raw.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            return True
+        except Exception:
+            return False
+
+    def getconn(self):
+        started = time.monotonic()
+        deadline = started + self.timeout
+
+        while True:
+            conn = None
+            create = False
+            with self._cond:
+                if self._closed:
+                    raise PoolTimeout("Connection pool is closed")
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise PoolTimeout(
+                            f"No database connection available after {self.timeout}s"
+                        )
+                    self._waiters += 1
+                    self._stats["waits"] += 1
+                    self._stats["waiters_max"] = max(
+                        self._stats["waiters_max"], self._waiters
+                    )
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiters -= 1
+
+                if self._idle:
+                    conn = self._idle.pop()
+                else:
+                    self._size += 1
+                    create = True
+
+            if create:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            elif not self._is_healthy(conn):
+                with self._cond:
+                    self._stats["health_check_failures"] += 1
+                self._discard(conn)
+                continue
+
+            elapsed_ms = (time.monotonic() - started) * 1000
+            with self._cond:
+                self._stats["checkouts"] += 1
+                self._stats["checkout_time_total_ms"] += elapsed_ms
+                self._stats["checkout_time_max_ms"] = max(
+                    self._stats["checkout_time_max_ms"], elapsed_ms
+                )
+            return conn
+
+    def putconn(self, conn):
+        if conn.closed or self._closed:
+            self._discard(conn)
+            return
+
+        try:
+            status = conn.raw.get_transaction_status()
+            if status != extensions.TRANSACTION_STATUS_IDLE:
+                conn.raw.rollback()
+            if not conn.raw.autocommit:
+                conn.raw.autocommit = True
+        except Exception:
+            self._discard(conn)
+            return
+
+        conn.last_used = time.monotonic()
+        with self._cond:
+            self._idle.append(conn)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        conn = self.getconn()
+        try:
+            yield conn
+        finally:
+            self.putconn(conn)
+
+    def _reap_loop(self):
+        while not self._closed:
+            time.sleep(self.reap_interval)
+            try:
+                self.reap()
+            except Exception as e:
+                print(f"DB pool reaper error: {e}")
+
+    def reap(self):
+        now = time.monotonic()
+        expired = []
+        with self._cond:
+            keep = deque()
+            for conn in self._idle:
+                too_old = now - conn.created_at > self.max_lifetime
+                too_idle = now - conn.last_used > self.max_idle
+                if too_old or (too_idle and self._size - len(expired) > self.min_size):
+                    expired.append(conn)
+                else:
+                    keep.append(conn)
+            self._idle = keep
+            self._stats["reaped"] += len(expired)
+            missing = self.min_size - (self._size - len(expired))
+
+        for conn in expired:
+            self._discard(conn)
+
+        for _ in range(max(missing, 0)):
+            with self._cond:
+                if self._size >= self.min_size:
+                    break
+                self._size += 1
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                raise
+            self.putconn(conn)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for conn in idle:
+            self._discard(conn)
+
+    def stats(self):
+        with self._cond:
+            data = dict(self._stats)
+            data.update(
+                {
+                    "size": self._size,
+                    "idle": len(self._idle),
+                    "in_use": self._size - len(self._idle),
+                    "waiters": self._waiters,
+                    "min_size": self.min_size,
+                    "max_size": self.max_size,
+                }
+            )
+        checkouts = data["checkouts"]
+        data["checkout_time_avg_ms"] = (
+            data["checkout_time_total_ms"] / checkouts if checkouts else 0.0
+        )
+        return data
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def _connection_kwargs():
+    db = settings.DATABASES["default"]
+    kwargs = {
+        "dbname": db.get("NAME"),
+        "user": db.get("USER"),
+        "password": db.get("PASSWORD"),
+        "host": db.get("HOST") or None,
+        "port": db.get("PORT") or None,
+    }
+    kwargs.update(db.get("OPTIONS", {}))
+    return {k: v for k, v in kwargs.items() if v is not None}
+
+
+def get_pool():
+    # Re-create the pool after a fork so worker processes never share sockets.
+    global _pool, _pool_pid
+    pid = os.getpid()
+    if _pool is not None and _pool_pid == pid:
+        return _pool
+
+    with _pool_lock:
+        if _pool is None or _pool_pid != pid:
+            conf = {**DEFAULT_POOL_SETTINGS, **getattr(settings, "DB_POOL", {})}
+            _pool = ConnectionPool(
+                _connection_kwargs(),
+                min_size=conf["MIN_SIZE"],
+                max_size=conf["MAX_SIZE"],
+                timeout=conf["TIMEOUT"],
+                max_idle=conf["MAX_IDLE"],
+                max_lifetime=conf["MAX_LIFETIME"],
+                health_check_after=conf["HEALTH_CHECK_AFTER"],
+                reap_interval=conf["REAP_INTERVAL"],
+                statement_cache_size=conf["STATEMENT_CACHE_SIZE"],
+            )
+            _pool_pid = pid
+    return _pool
+
+
+def pool_stats():
+    data = get_pool().stats()
+    data["prepared_statements"] = statement_stats()
+    return data
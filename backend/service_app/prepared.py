@@ -0,0 +1,121 @@
+# Hospital_Management/backend/service_app/prepared.py
+import re
+import threading
+from collections import OrderedDict
+
+from psycopg2 import errors
+
+
+_PLACEHOLDER = re.compile(r"%%|%s|%\(")
+
+_counters = {"hits": 0, "misses": 0, "evictions": 0, "reprepares": 0}
+_counters_lock = threading.Lock()
+
+
+def _count(name):
+    with _counters_lock:
+        _counters[name] += 1
+
+
+def statement_stats():
+    with _counters_lock:
+        data = dict(_counters)
+    lookups = data["hits"] + data["misses"]
+    data["hit_ratio"] = data["hits"] / lookups if lookups else 0.0
+    return data
+
+
+def to_server_syntax(query):
+    """
+    Rewrite a %s-style query as PREPARE-able text with $1..$n placeholders.
+    Returns (text, n_params), or None if the query uses named placeholders.
+    """
+    count = 0
+
+    def replace(match):
+        nonlocal count
+        token = match.group(0)
+        if token == "%%":
+            return "%"
+        if token == "%(":
+            raise ValueError
+        count += 1
+        return f"${count}"
+
+    try:
+        text = _PLACEHOLDER.sub(replace, query.strip().rstrip(";").strip())
+    except ValueError:
+        return None
+    return text, count
+
+
+class StatementCache:
+    """
+    Per-connection LRU of server-side prepared statements. Each distinct
+    query text is PREPAREd once on the connection and then EXECUTEd.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._names = OrderedDict()
+        self._seq = 0
+
+    def clear(self):
+        self._names.clear()
+
+    def _prepare(self, cursor, query, text):
+        self._seq += 1
+        name = f"ps_{self._seq}"
+        cursor.execute(f"PREPARE {name} AS {text}")
+        self._names[query] = name
+
+        while len(self._names) > self.maxsize:
+            _, evicted = self._names.popitem(last=False)
+            cursor.execute(f"DEALLOCATE {evicted}")
+            _count("evictions")
+        return name
+
+    def execute(self, cursor, query, params=None):
+        if self.maxsize <= 0:
+            cursor.execute(query, params)
+            return
+
+        if params is None:
+            # The driver sends parameterless queries verbatim (no %% unescaping).
+            converted = (query.strip().rstrip(";").strip(), 0)
+        else:
+            converted = to_server_syntax(query)
+        n_params = len(params) if params else 0
+        if converted is None or converted[1] != n_params:
+            cursor.execute(query, params)
+            return
+        text = converted[0]
+
+        name = self._names.get(query)
+        if name is None:
+            _count("misses")
+            name = self._prepare(cursor, query, text)
+        else:
+            _count("hits")
+            self._names.move_to_end(query)
+
+        try:
+            self._execute_prepared(cursor, name, n_params, params)
+        except errors.FeatureNotSupported:
+            # "cached plan must not change result type": the function was
+            # redefined since we prepared it. Only retry outside a transaction.
+            if not cursor.connection.autocommit:
+                raise
+            _count("reprepares")
+            del self._names[query]
+            cursor.execute(f"DEALLOCATE {name}")
+            name = self._prepare(cursor, query, text)
+            self._execute_prepared(cursor, name, n_params, params)
+
+    @staticmethod
+    def _execute_prepared(cursor, name, n_params, params):
+        if n_params:
+            placeholders = ", ".join(["%s"] * n_params)
+            cursor.execute(f"EXECUTE {name} ({placeholders})", params)
+        else:
+            cursor.execute(f"EXECUTE {name}")
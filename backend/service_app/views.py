@@ -0,0 +1,16 @@
+# Hospital_Management/backend/service_app/views.py
+from django.http import HttpRequest
+from rest_framework import generics, status
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from users.authentication import JWTAuthentication
+
+from .db_pool import pool_stats
+
+
+class DbPoolStats(generics.GenericAPIView):
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request: HttpRequest):
+        return Response(pool_stats(), status=status.HTTP_200_OK)
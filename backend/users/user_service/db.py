@@ -1,24 +1,4 @@
 # Hospital_Management\backend\users\user_service\db.py
-from django.db import connection
+from service_app.db import Row, execute, fetch_all, fetch_iter, fetch_one, transaction
 
-
-def fetch_one(query, params=None):
-    with connection.cursor() as cursor:
-        cursor.execute(query, params)
-        row = cursor.fetchone()
-        if not row:
-            return None
-        columns = [col[0] for col in cursor.description]
-        return dict(zip(columns, row))
-
-
-def fetch_all(query, params=None):
-    with connection.cursor() as cursor:
-        cursor.execute(query, params)
-        columns = [col[0] for col in cursor.description]
-        return [dict(zip(columns, row)) for row in cursor.fetchall()]
-
-
-def execute(query, params=None):
-    with connection.cursor() as cursor:
-        cursor.execute(query, params)
+__all__ = ["Row", "execute", "fetch_all", "fetch_iter", "fetch_one", "transaction"]
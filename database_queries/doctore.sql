@@ -86,6 +86,87 @@ VALUES
 ON CONFLICT DO NOTHING;
 
 
+-- Read model for the doctor list, directory and profile: one row per
+-- doctor with the gender label and qualification codes already resolved.
+-- Kept current by refresh_doctor_directory(), which every function that
+-- writes doctors or doctor_qualifications calls.
+CREATE TABLE IF NOT EXISTS doctor_directory (
+    doctor_id INT PRIMARY KEY REFERENCES doctors(doctor_id) ON DELETE CASCADE,
+    full_name VARCHAR(255) NOT NULL,
+    experience_years NUMERIC(4,2) NOT NULL,
+    gender_id INT,
+    gender VARCHAR(20),
+    phone_number VARCHAR(15) NOT NULL,
+    email VARCHAR(255),
+    consultation_fee NUMERIC(10,2),
+    profile_image VARCHAR(255),
+    joining_date DATE,
+    is_active BOOLEAN NOT NULL,
+    qualifications TEXT[] NOT NULL DEFAULT ARRAY[]::TEXT[],
+    updated_at TIMESTAMPTZ
+);
+
+CREATE OR REPLACE FUNCTION refresh_doctor_directory(p_doctor_ids INT[])
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO doctor_directory (
+        doctor_id,
+        full_name,
+        experience_years,
+        gender_id,
+        gender,
+        phone_number,
+        email,
+        consultation_fee,
+        profile_image,
+        joining_date,
+        is_active,
+        qualifications,
+        updated_at
+    )
+    SELECT
+        d.doctor_id,
+        d.full_name,
+        d.experience_years,
+        d.gender_id,
+        g.gender_value,
+        d.phone_number,
+        d.email,
+        d.consultation_fee,
+        d.profile_image,
+        d.joining_date,
+        d.is_active,
+        COALESCE(qa.codes, ARRAY[]::TEXT[]),
+        d.updated_at
+    FROM doctors d
+    LEFT JOIN genders g ON g.gender_id = d.gender_id
+    LEFT JOIN LATERAL (
+        SELECT ARRAY_AGG(q.qualification_code::TEXT ORDER BY q.qualification_code::TEXT) AS codes
+        FROM doctor_qualifications dq
+        JOIN qualifications q ON q.qualification_id = dq.qualification_id
+        WHERE dq.doctor_id = d.doctor_id
+    ) qa ON TRUE
+    WHERE d.doctor_id = ANY(p_doctor_ids)
+    ON CONFLICT (doctor_id) DO UPDATE SET
+        full_name = EXCLUDED.full_name,
+        experience_years = EXCLUDED.experience_years,
+        gender_id = EXCLUDED.gender_id,
+        gender = EXCLUDED.gender,
+        phone_number = EXCLUDED.phone_number,
+        email = EXCLUDED.email,
+        consultation_fee = EXCLUDED.consultation_fee,
+        profile_image = EXCLUDED.profile_image,
+        joining_date = EXCLUDED.joining_date,
+        is_active = EXCLUDED.is_active,
+        qualifications = EXCLUDED.qualifications,
+        updated_at = EXCLUDED.updated_at;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Backfill; also the way to resync after editing genders or qualifications.
+SELECT refresh_doctor_directory(ARRAY(SELECT doctor_id FROM doctors));
+
+
 CREATE OR REPLACE FUNCTION register_doctor(
     p_full_name VARCHAR,
     p_experience_years NUMERIC,
@@ -126,6 +207,8 @@ BEGIN
     INSERT INTO doctor_qualifications (doctor_id, qualification_id)
     SELECT v_doctor_id, unnest(p_qualification_ids);
 
+    PERFORM refresh_doctor_directory(ARRAY[v_doctor_id]);
+
     RETURN v_doctor_id;
 
 EXCEPTION
@@ -150,8 +233,43 @@ CREATE OR REPLACE FUNCTION update_doctor_profile(
     p_qualification_ids INT[]
 )
 RETURNS BOOLEAN AS $$
+DECLARE
+    v_rows INT;
+    v_changed BOOLEAN := FALSE;
 BEGIN
-    UPDATE doctors
+    -- Row lock so concurrent saves of the same doctor apply their diffs in turn.
+    PERFORM 1
+    FROM doctors d
+    WHERE d.doctor_id = p_doctor_id
+      AND d.is_active = TRUE
+    FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RETURN FALSE;
+    END IF;
+
+    -- Touch only the qualifications that were removed or added.
+    DELETE FROM doctor_qualifications dq
+    WHERE dq.doctor_id = p_doctor_id
+      AND dq.qualification_id <> ALL (p_qualification_ids);
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    v_changed := v_rows > 0;
+
+    INSERT INTO doctor_qualifications (doctor_id, qualification_id)
+    SELECT p_doctor_id, u.qualification_id
+    FROM unnest(p_qualification_ids) AS u(qualification_id)
+    WHERE NOT EXISTS (
+        SELECT 1 FROM doctor_qualifications dq
+        WHERE dq.doctor_id = p_doctor_id
+          AND dq.qualification_id = u.qualification_id
+    );
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    v_changed := v_changed OR v_rows > 0;
+
+    -- Skip the row update (and its new tuple) when the save changed nothing.
+    -- A qualification change still bumps updated_at, which the profile ETag uses.
+    -- No uploaded image keeps the current one.
+    UPDATE doctors d
     SET
         full_name = p_full_name,
         experience_years = p_experience_years,
@@ -159,21 +277,34 @@ BEGIN
         phone_number = p_phone_number,
         email = p_email,
         consultation_fee = p_consultation_fee,
-        profile_image = p_profile_image,
+        profile_image = COALESCE(p_profile_image, d.profile_image),
         updated_at = NOW()
-    WHERE doctor_id = p_doctor_id
-      AND is_active = TRUE;
+    WHERE d.doctor_id = p_doctor_id
+      AND (
+        v_changed
+        OR (
+            d.full_name,
+            d.experience_years,
+            d.gender_id,
+            d.phone_number,
+            d.email,
+            d.consultation_fee,
+            d.profile_image
+        ) IS DISTINCT FROM (
+            p_full_name,
+            p_experience_years,
+            p_gender_id,
+            p_phone_number,
+            p_email,
+            p_consultation_fee,
+            COALESCE(p_profile_image, d.profile_image)
+        )
+      );
 
-    IF NOT FOUND THEN
-        RETURN FALSE;
+    IF FOUND THEN
+        PERFORM refresh_doctor_directory(ARRAY[p_doctor_id]);
     END IF;
 
-    DELETE FROM doctor_qualifications
-    WHERE doctor_id = p_doctor_id;
-
-    INSERT INTO doctor_qualifications (doctor_id, qualification_id)
-    SELECT p_doctor_id, unnest(p_qualification_ids);
-
     RETURN TRUE;
 
 EXCEPTION
@@ -196,22 +327,305 @@ RETURNS TABLE (
 BEGIN
     RETURN QUERY
     SELECT
-        d.doctor_id,
-        d.full_name,
-        g.gender_value,
-        d.email,
-        d.consultation_fee,
-        COALESCE(ARRAY_AGG(DISTINCT q.qualification_code::TEXT ORDER BY q.qualification_code::TEXT), ARRAY[]::text[])
+        dd.doctor_id,
+        dd.full_name,
+        dd.gender,
+        dd.email,
+        dd.consultation_fee,
+        dd.qualifications
+    FROM doctor_directory dd
+    WHERE dd.is_active = TRUE
+    ORDER BY dd.full_name, dd.doctor_id;
+END;
+$$ LANGUAGE plpgsql;
+
+
+drop function get_doctor_profile;
+CREATE OR REPLACE FUNCTION get_doctor_profile(p_doctor_id INT)
+RETURNS TABLE (
+    doctor_id INT,
+    full_name VARCHAR,
+    experience_years NUMERIC,
+    gender VARCHAR,
+    phone_number VARCHAR,
+    email VARCHAR,
+    consultation_fee NUMERIC,
+    profile_image VARCHAR,
+    joining_date DATE,
+    qualifications TEXT[],
+    updated_at TIMESTAMPTZ
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        dd.doctor_id,
+        dd.full_name,
+        dd.experience_years,
+        dd.gender,
+        dd.phone_number,
+        dd.email,
+        dd.consultation_fee,
+        dd.profile_image,
+        dd.joining_date,
+        dd.qualifications,
+        dd.updated_at
+    FROM doctor_directory dd
+    WHERE dd.doctor_id = p_doctor_id
+      AND dd.is_active = TRUE;
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- Cheap freshness probe for conditional GETs on a doctor profile.
+CREATE OR REPLACE FUNCTION doctor_version(p_doctor_id INT)
+RETURNS TABLE (
+    version TIMESTAMPTZ
+) AS $$
+    SELECT d.updated_at
     FROM doctors d
-    LEFT JOIN genders g ON g.gender_id = d.gender_id
-    LEFT JOIN doctor_qualifications dq ON dq.doctor_id = d.doctor_id
-    LEFT JOIN qualifications q ON q.qualification_id = dq.qualification_id
-    WHERE d.is_active = TRUE
-    GROUP BY d.doctor_id, g.gender_value
-    ORDER BY d.full_name;
+    WHERE d.doctor_id = p_doctor_id
+      AND d.is_active = TRUE;
+$$ LANGUAGE sql STABLE;
+
+
+-- Set-based register_doctor() for a batch. p_doctors is a JSON array of
+-- objects with register_doctor's fields plus a caller-chosen row_no.
+-- Returns one row per input: the new doctor_id, -1 for a duplicate phone
+-- or email (against existing doctors or an earlier row in the batch), or
+-- -2 for an unknown gender or qualification.
+CREATE OR REPLACE FUNCTION register_doctors_bulk(p_doctors JSONB)
+RETURNS TABLE (
+    row_no INT,
+    doctor_id INT
+) AS $$
+BEGIN
+    -- Keeps concurrent registrations from racing the duplicate checks below.
+    LOCK TABLE doctors IN SHARE ROW EXCLUSIVE MODE;
+
+    RETURN QUERY
+    WITH input AS (
+        SELECT
+            (e.doc->>'row_no')::INT AS row_no,
+            (e.doc->>'full_name')::VARCHAR AS full_name,
+            (e.doc->>'experience_years')::NUMERIC AS experience_years,
+            (e.doc->>'gender_id')::INT AS gender_id,
+            (e.doc->>'phone_number')::VARCHAR AS phone_number,
+            (e.doc->>'email')::VARCHAR AS email,
+            (e.doc->>'consultation_fee')::NUMERIC AS consultation_fee,
+            (e.doc->>'profile_image')::VARCHAR AS profile_image,
+            (e.doc->>'joining_date')::DATE AS joining_date,
+            ARRAY(
+                SELECT jsonb_array_elements_text(e.doc->'qualification_ids')::INT
+            ) AS qualification_ids
+        FROM jsonb_array_elements(p_doctors) AS e(doc)
+    ),
+    checked AS (
+        SELECT
+            i.*,
+            CASE
+                WHEN EXISTS (
+                    SELECT 1 FROM doctors d
+                    WHERE d.phone_number = i.phone_number
+                       OR d.email = i.email
+                ) THEN -1
+                WHEN i.gender_id IS NOT NULL AND NOT EXISTS (
+                    SELECT 1 FROM genders g WHERE g.gender_id = i.gender_id
+                ) THEN -2
+                WHEN EXISTS (
+                    SELECT 1 FROM unnest(i.qualification_ids) AS u(qualification_id)
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM qualifications q
+                        WHERE q.qualification_id = u.qualification_id
+                    )
+                ) THEN -2
+                ELSE 0
+            END AS outcome
+        FROM input i
+    ),
+    -- Batch duplicates are removed in sequence: first phone, then email
+    -- among the rows left, so a row is never rejected as the duplicate of
+    -- a row that was itself rejected.
+    phone_ranked AS (
+        SELECT
+            c.*,
+            row_number() OVER (PARTITION BY c.phone_number ORDER BY c.row_no) AS phone_rank
+        FROM checked c
+        WHERE c.outcome = 0
+    ),
+    email_ranked AS (
+        SELECT
+            p.*,
+            row_number() OVER (PARTITION BY p.email ORDER BY p.row_no) AS email_rank
+        FROM phone_ranked p
+        WHERE p.phone_rank = 1
+    ),
+    accepted AS (
+        SELECT r.*
+        FROM email_ranked r
+        WHERE r.email IS NULL OR r.email_rank = 1
+    ),
+    new_doctors AS (
+        INSERT INTO doctors (
+            full_name,
+            experience_years,
+            gender_id,
+            phone_number,
+            email,
+            consultation_fee,
+            profile_image,
+            joining_date
+        )
+        SELECT
+            a.full_name,
+            a.experience_years,
+            a.gender_id,
+            a.phone_number,
+            a.email,
+            a.consultation_fee,
+            COALESCE(a.profile_image, '/media/defaults/patient.png'),
+            a.joining_date
+        FROM accepted a
+        ORDER BY a.row_no
+        RETURNING doctors.doctor_id, doctors.phone_number
+    ),
+    inserted AS (
+        SELECT a.row_no, n.doctor_id, a.qualification_ids
+        FROM accepted a
+        JOIN new_doctors n ON n.phone_number = a.phone_number
+    ),
+    new_qualifications AS (
+        INSERT INTO doctor_qualifications (doctor_id, qualification_id)
+        SELECT ins.doctor_id, unnest(ins.qualification_ids)
+        FROM inserted ins
+    )
+    SELECT
+        c.row_no,
+        CASE
+            WHEN c.outcome <> 0 THEN c.outcome
+            ELSE COALESCE(ins.doctor_id, -1)
+        END
+    FROM checked c
+    LEFT JOIN inserted ins ON ins.row_no = c.row_no
+    ORDER BY c.row_no;
+
+    -- Rows inserted above are only visible from the next statement on.
+    -- Refreshing an existing doctor whose phone was in the batch is a no-op.
+    PERFORM refresh_doctor_directory(ARRAY(
+        SELECT d.doctor_id
+        FROM doctors d
+        JOIN jsonb_array_elements(p_doctors) AS e(doc)
+          ON d.phone_number = e.doc->>'phone_number'
+    ));
 END;
 $$ LANGUAGE plpgsql;
 
+-- Indexes behind get_doctor_directory() and get_doctors_list(): one per
+-- sort order, each ending in doctor_id so the keyset comparison is a single
+-- index range, plus a GIN index for the qualification filter.
+DROP INDEX IF EXISTS idx_doctors_active_name;
+DROP INDEX IF EXISTS idx_doctors_active_fee;
+DROP INDEX IF EXISTS idx_doctors_active_experience;
+DROP INDEX IF EXISTS idx_doctor_qualifications_qualification;
+CREATE INDEX IF NOT EXISTS idx_doctor_directory_active_name
+    ON doctor_directory (full_name, doctor_id) WHERE is_active = TRUE;
+CREATE INDEX IF NOT EXISTS idx_doctor_directory_active_fee
+    ON doctor_directory ((COALESCE(consultation_fee, 0)), doctor_id) WHERE is_active = TRUE;
+CREATE INDEX IF NOT EXISTS idx_doctor_directory_active_experience
+    ON doctor_directory (experience_years, doctor_id) WHERE is_active = TRUE;
+CREATE INDEX IF NOT EXISTS idx_doctor_directory_qualifications
+    ON doctor_directory USING GIN (qualifications);
+
+
+-- One page of the doctor directory, ordered by p_sort ('name', 'fee' or
+-- 'experience') then doctor_id. Pass the last row's sort key (as text) and
+-- doctor_id to get the next page. Filters left NULL are not applied. A
+-- doctor without a fee sorts as fee 0.
+CREATE OR REPLACE FUNCTION get_doctor_directory(
+    p_qualification_code VARCHAR,
+    p_gender_id INT,
+    p_min_fee NUMERIC,
+    p_max_fee NUMERIC,
+    p_min_experience NUMERIC,
+    p_sort VARCHAR,
+    p_descending BOOLEAN,
+    p_after_key TEXT,
+    p_after_id INT,
+    p_limit INT
+)
+RETURNS TABLE (
+    doctor_id INT,
+    full_name VARCHAR,
+    gender VARCHAR,
+    email VARCHAR,
+    consultation_fee NUMERIC,
+    experience_years NUMERIC,
+    qualifications TEXT[],
+    sort_key TEXT
+) AS $$
+DECLARE
+    v_key TEXT;
+    v_key_type TEXT;
+    v_direction TEXT := CASE WHEN p_descending THEN 'DESC' ELSE 'ASC' END;
+    v_where TEXT := 'dd.is_active = TRUE';
+BEGIN
+    CASE p_sort
+        WHEN 'fee' THEN
+            v_key := 'COALESCE(dd.consultation_fee, 0)';
+            v_key_type := 'NUMERIC';
+        WHEN 'experience' THEN
+            v_key := 'dd.experience_years';
+            v_key_type := 'NUMERIC';
+        ELSE
+            v_key := 'dd.full_name';
+            v_key_type := 'VARCHAR';
+    END CASE;
+
+    IF p_qualification_code IS NOT NULL THEN
+        v_where := v_where || ' AND dd.qualifications @> ARRAY[$1]';
+    END IF;
+    IF p_gender_id IS NOT NULL THEN
+        v_where := v_where || ' AND dd.gender_id = $2';
+    END IF;
+    IF p_min_fee IS NOT NULL THEN
+        v_where := v_where || ' AND dd.consultation_fee >= $3';
+    END IF;
+    IF p_max_fee IS NOT NULL THEN
+        v_where := v_where || ' AND dd.consultation_fee <= $4';
+    END IF;
+    IF p_min_experience IS NOT NULL THEN
+        v_where := v_where || ' AND dd.experience_years >= $5';
+    END IF;
+    IF p_after_id IS NOT NULL THEN
+        v_where := v_where || format(
+            ' AND (%s, dd.doctor_id) %s ($6::%s, $7)',
+            v_key,
+            CASE WHEN p_descending THEN '<' ELSE '>' END,
+            v_key_type
+        );
+    END IF;
+
+    RETURN QUERY EXECUTE format(
+        'SELECT
+            dd.doctor_id,
+            dd.full_name,
+            dd.gender,
+            dd.email,
+            dd.consultation_fee,
+            dd.experience_years,
+            dd.qualifications,
+            (%1$s)::TEXT
+        FROM doctor_directory dd
+        WHERE %2$s
+        ORDER BY %1$s %3$s, dd.doctor_id %3$s
+        LIMIT $8',
+        v_key,
+        v_where,
+        v_direction
+    )
+    USING upper(p_qualification_code)::TEXT, p_gender_id, p_min_fee, p_max_fee,
+          p_min_experience, p_after_key, p_after_id, p_limit;
+END;
+$$ LANGUAGE plpgsql;
 
 -- SELECT register_doctor('Dr. Chirag Dumaniya', 2, 1, '9879879870', 'chirag@gmail.com', 500, '/media/defaults/patient.png', '2025-01-01', ARRAY[1]);
 -- SELECT register_doctor('Dr. Mehul Patel', 5, 1, '9988776655', 'mehul@gmail.com', 800, '/media/defaults/patient.png', '2024-06-15', ARRAY[1,2]);
@@ -70,6 +70,59 @@ END;
 $$;
 
 
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_patients_name_trgm
+    ON patients USING gin (patient_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_patients_email_trgm
+    ON patients USING gin (email gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_patients_email_lower
+    ON patients (lower(email));
+CREATE INDEX IF NOT EXISTS idx_patients_id_text
+    ON patients ((patient_id::TEXT) text_pattern_ops);
+
+
+-- Builds the WHERE clause shared by the patient listing functions. They run
+-- it through EXECUTE so every call is planned with the real search text:
+-- a numeric query is a prefix (or exact) match on patient_id via
+-- idx_patients_id_text, anything else is a substring match on name/email
+-- that the trigram indexes can serve. NULL emails simply do not match, so
+-- the old COALESCE(email, '') wrapper is not needed.
+CREATE OR REPLACE FUNCTION patient_search_filter(
+    p_query TEXT,
+    p_category VARCHAR
+)
+RETURNS TEXT
+LANGUAGE plpgsql
+IMMUTABLE
+AS $$
+DECLARE
+    v_filter TEXT := 'TRUE';
+BEGIN
+    IF p_category IS NOT NULL AND p_category NOT IN ('', 'all') THEN
+        v_filter := v_filter || format(' AND p.status = %L', p_category);
+    END IF;
+
+    IF p_query IS NULL OR p_query = '' THEN
+        RETURN v_filter;
+    END IF;
+
+    IF p_query ~ '^[0-9]+$' THEN
+        v_filter := v_filter
+            || format(' AND p.patient_id::TEXT LIKE %L', p_query || '%');
+    ELSE
+        v_filter := v_filter || format(
+            ' AND (p.patient_name ILIKE %L OR p.email ILIKE %L)',
+            '%' || p_query || '%',
+            '%' || p_query || '%'
+        );
+    END IF;
+
+    RETURN v_filter;
+END;
+$$;
+
+
 CREATE OR REPLACE FUNCTION count_display_patients(
     p_query TEXT,
     p_category VARCHAR
@@ -80,21 +133,11 @@ AS $$
 DECLARE
     total_count INTEGER;
 BEGIN
-    SELECT COUNT(*) INTO total_count
-    FROM patients p
-    WHERE (
-        p_category IS NULL
-        OR p_category = ''
-        OR p_category = 'all'
-        OR p.status = p_category
+    EXECUTE format(
+        'SELECT COUNT(*) FROM patients p WHERE %s',
+        patient_search_filter(p_query, p_category)
     )
-    AND (
-        p_query IS NULL
-        OR p_query = ''
-        OR p.patient_id::TEXT LIKE p_query || '%'
-        OR p.patient_name ILIKE '%' || p_query || '%'
-        OR COALESCE(p.email, '') ILIKE '%' || p_query || '%'
-    );
+    INTO total_count;
 
     RETURN total_count;
 END;
@@ -117,31 +160,22 @@ RETURNS TABLE (
 LANGUAGE plpgsql
 AS $$
 BEGIN
-    RETURN QUERY
-    SELECT
-        p.patient_id,
-        p.patient_name,
-        p.email,
-        p.mobile,
-        p.gender,
-        p.status
-    FROM patients p
-    WHERE (
-        p_category IS NULL
-        OR p_category = ''
-        OR p_category = 'all'
-        OR p.status = p_category
+    RETURN QUERY EXECUTE format(
+        'SELECT
+            p.patient_id,
+            p.patient_name,
+            p.email,
+            p.mobile,
+            p.gender,
+            p.status
+        FROM patients p
+        WHERE %s
+        ORDER BY p.patient_id
+        LIMIT $1
+        OFFSET $2',
+        patient_search_filter(p_query, p_category)
     )
-    AND (
-        p_query IS NULL
-        OR p_query = ''
-        OR p.patient_id::TEXT LIKE '%' || p_query || '%'
-        OR p.patient_name ILIKE '%' || p_query || '%'
-        OR COALESCE(p.email, '') ILIKE '%' || p_query || '%'
-    )
-    ORDER BY p.patient_id
-    LIMIT p_limit
-    OFFSET p_offset;
+    USING p_limit, p_offset;
 END;
 $$;
 
@@ -181,9 +215,9 @@ BEGIN
         p.address,
         p.profile_image,
         p.status,
-        p.created_at,
+        p.created_at::TIMESTAMP,
         p.created_by,
-        p.updated_at,
+        p.updated_at::TIMESTAMP,
         p.updated_by,
         p.update_reason
     FROM patients p
@@ -272,4 +306,576 @@ BEGIN
 
     RETURN p_patient_id; -- Success
 END;
-$$;
\ No newline at end of file
+$$;
+
+CREATE INDEX IF NOT EXISTS idx_patients_status_id ON patients (status, patient_id);
+
+-- Keyset pagination: range scan on the patient_id primary key instead of
+-- OFFSET. p_after walks forward; p_before walks backward and returns rows
+-- in descending order, which the caller reverses.
+CREATE OR REPLACE FUNCTION display_patients_keyset(
+    p_query TEXT,
+    p_category VARCHAR,
+    p_after INTEGER,
+    p_before INTEGER,
+    p_limit INTEGER
+)
+RETURNS TABLE (
+    patient_id INTEGER,
+    patient_name VARCHAR,
+    email VARCHAR,
+    mobile VARCHAR,
+    gender CHAR,
+    status CHAR
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF p_before IS NOT NULL THEN
+        RETURN QUERY EXECUTE format(
+            'SELECT
+                p.patient_id,
+                p.patient_name,
+                p.email,
+                p.mobile,
+                p.gender,
+                p.status
+            FROM patients p
+            WHERE p.patient_id < $1 AND %s
+            ORDER BY p.patient_id DESC
+            LIMIT $2',
+            patient_search_filter(p_query, p_category)
+        )
+        USING p_before, p_limit;
+        RETURN;
+    END IF;
+
+    RETURN QUERY EXECUTE format(
+        'SELECT
+            p.patient_id,
+            p.patient_name,
+            p.email,
+            p.mobile,
+            p.gender,
+            p.status
+        FROM patients p
+        WHERE p.patient_id > $1 AND %s
+        ORDER BY p.patient_id
+        LIMIT $2',
+        patient_search_filter(p_query, p_category)
+    )
+    USING COALESCE(p_after, 0), p_limit;
+END;
+$$;
+
+
+-- Page and total in one statement. The filtered total comes from a window
+-- count over the same scan; for the unfiltered 'all' listing (and unless
+-- p_exact is set) it is the planner's row estimate scaled to the current
+-- table size, which avoids counting the whole table.
+CREATE OR REPLACE FUNCTION display_patients_page(
+    p_query TEXT,
+    p_category VARCHAR,
+    p_limit INTEGER,
+    p_offset INTEGER,
+    p_exact BOOLEAN
+)
+RETURNS TABLE (
+    patient_id INTEGER,
+    patient_name VARCHAR,
+    email VARCHAR,
+    mobile VARCHAR,
+    gender CHAR,
+    status CHAR,
+    total_count BIGINT,
+    total_exact BOOLEAN
+)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_estimate BIGINT;
+BEGIN
+    IF NOT COALESCE(p_exact, FALSE)
+        AND (p_query IS NULL OR p_query = '')
+        AND (p_category IS NULL OR p_category = '' OR p_category = 'all')
+    THEN
+        SELECT
+            CASE
+                WHEN c.reltuples < 0 OR c.relpages = 0 THEN NULL
+                ELSE (
+                    c.reltuples / c.relpages
+                    * (pg_relation_size(c.oid) / current_setting('block_size')::INTEGER)
+                )::BIGINT
+            END
+        INTO v_estimate
+        FROM pg_class c
+        WHERE c.oid = 'patients'::regclass;
+    END IF;
+
+    IF v_estimate IS NOT NULL THEN
+        RETURN QUERY
+        SELECT
+            p.patient_id,
+            p.patient_name,
+            p.email,
+            p.mobile,
+            p.gender,
+            p.status,
+            v_estimate,
+            FALSE
+        FROM patients p
+        ORDER BY p.patient_id
+        LIMIT p_limit
+        OFFSET p_offset;
+        RETURN;
+    END IF;
+
+    RETURN QUERY EXECUTE format(
+        'SELECT
+            p.patient_id,
+            p.patient_name,
+            p.email,
+            p.mobile,
+            p.gender,
+            p.status,
+            COUNT(*) OVER (),
+            TRUE
+        FROM patients p
+        WHERE %s
+        ORDER BY p.patient_id
+        LIMIT $1
+        OFFSET $2',
+        patient_search_filter(p_query, p_category)
+    )
+    USING p_limit, p_offset;
+END;
+$$;
+
+
+-- Normalised mobile: digits only, last 10 (drops +91 / leading 0 / spaces).
+CREATE INDEX IF NOT EXISTS idx_patients_mobile_norm
+    ON patients ((right(regexp_replace(mobile, '[^0-9]', '', 'g'), 10)));
+
+-- Exact-match lookups for searches the API has already classified as a
+-- mobile number, an email or a patient id. Each branch is a plain B-tree
+-- probe (idx_patients_mobile_norm, idx_patients_email_lower, primary key).
+CREATE OR REPLACE FUNCTION lookup_patients(
+    p_kind TEXT,
+    p_value TEXT,
+    p_category VARCHAR
+)
+RETURNS TABLE (
+    patient_id INTEGER,
+    patient_name VARCHAR,
+    email VARCHAR,
+    mobile VARCHAR,
+    gender CHAR,
+    status CHAR
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF p_kind = 'mobile' THEN
+        RETURN QUERY
+        SELECT p.patient_id, p.patient_name, p.email, p.mobile, p.gender, p.status
+        FROM patients p
+        WHERE right(regexp_replace(p.mobile, '[^0-9]', '', 'g'), 10) = p_value
+        AND (p_category IS NULL OR p_category IN ('', 'all') OR p.status = p_category)
+        ORDER BY p.patient_id;
+    ELSIF p_kind = 'email' THEN
+        RETURN QUERY
+        SELECT p.patient_id, p.patient_name, p.email, p.mobile, p.gender, p.status
+        FROM patients p
+        WHERE lower(p.email) = lower(p_value)
+        AND (p_category IS NULL OR p_category IN ('', 'all') OR p.status = p_category)
+        ORDER BY p.patient_id;
+    ELSIF p_kind = 'id' THEN
+        RETURN QUERY
+        SELECT p.patient_id, p.patient_name, p.email, p.mobile, p.gender, p.status
+        FROM patients p
+        WHERE p.patient_id = p_value::INTEGER
+        AND (p_category IS NULL OR p_category IN ('', 'all') OR p.status = p_category);
+    END IF;
+END;
+$$;
+
+
+-- Same rows as the patient list for the same query/category: a search
+-- the API classified as a mobile number, email or id (p_kind/p_value)
+-- returns lookup_patients() matches, falling back to the substring filter
+-- only when there are none. LANGUAGE sql so the planner inlines it and a
+-- server-side cursor can stream rows instead of materialising the whole
+-- set first.
+DROP FUNCTION IF EXISTS export_patients(TEXT, VARCHAR);
+
+CREATE OR REPLACE FUNCTION export_patients(
+    p_query TEXT,
+    p_category VARCHAR,
+    p_kind TEXT,
+    p_value TEXT
+)
+RETURNS TABLE (
+    patient_id INTEGER,
+    patient_name VARCHAR,
+    dob DATE,
+    email VARCHAR,
+    mobile VARCHAR,
+    gender CHAR,
+    blood_group VARCHAR,
+    address TEXT,
+    status CHAR,
+    created_at TIMESTAMPTZ,
+    created_by INTEGER,
+    updated_at TIMESTAMPTZ,
+    updated_by INTEGER
+)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH exact AS (
+        SELECT l.patient_id
+        FROM lookup_patients(p_kind, p_value, p_category) l
+        WHERE p_kind IS NOT NULL
+    )
+    SELECT
+        p.patient_id,
+        p.patient_name,
+        p.dob,
+        p.email,
+        p.mobile,
+        p.gender,
+        p.blood_group,
+        p.address,
+        p.status,
+        p.created_at,
+        p.created_by,
+        p.updated_at,
+        p.updated_by
+    FROM patients p
+    JOIN exact e ON e.patient_id = p.patient_id
+    UNION ALL
+    SELECT
+        p.patient_id,
+        p.patient_name,
+        p.dob,
+        p.email,
+        p.mobile,
+        p.gender,
+        p.blood_group,
+        p.address,
+        p.status,
+        p.created_at,
+        p.created_by,
+        p.updated_at,
+        p.updated_by
+    FROM patients p
+    WHERE NOT EXISTS (SELECT 1 FROM exact)
+    AND (
+        p_category IS NULL
+        OR p_category = ''
+        OR p_category = 'all'
+        OR p.status = p_category
+    )
+    AND (
+        p_query IS NULL
+        OR p_query = ''
+        OR (p_query ~ '^[0-9]+$' AND p.patient_id::TEXT LIKE p_query || '%')
+        OR (
+            p_query !~ '^[0-9]+$'
+            AND (
+                p.patient_name ILIKE '%' || p_query || '%'
+                OR p.email ILIKE '%' || p_query || '%'
+            )
+        )
+    )
+    ORDER BY 1;
+$$;
+
+
+-- Full-text search over name (weight A) and address (weight B). The
+-- generated column is kept current by Postgres on every insert/update.
+ALTER TABLE patients
+    ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', COALESCE(patient_name, '')), 'A')
+        || setweight(to_tsvector('simple', COALESCE(address, '')), 'B')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_patients_search_vector
+    ON patients USING gin (search_vector);
+
+-- Every word of p_query must match as a prefix ("pri pat ahmed" finds
+-- "Prit Patel, ... Ahmedabad"). Only rows found through the GIN index are
+-- ranked, so the cost follows the number of matches, not the table size.
+CREATE OR REPLACE FUNCTION search_patients_fulltext(
+    p_query TEXT,
+    p_category VARCHAR,
+    p_limit INTEGER
+)
+RETURNS TABLE (
+    patient_id INTEGER,
+    patient_name VARCHAR,
+    email VARCHAR,
+    mobile VARCHAR,
+    gender CHAR,
+    status CHAR,
+    address TEXT,
+    rank REAL
+)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_tsquery TSQUERY;
+BEGIN
+    SELECT to_tsquery('simple', string_agg(t.word || ':*', ' & '))
+    INTO v_tsquery
+    FROM regexp_split_to_table(lower(COALESCE(p_query, '')), '[^[:alnum:]]+') AS t(word)
+    WHERE t.word <> '';
+
+    IF v_tsquery IS NULL THEN
+        RETURN;
+    END IF;
+
+    RETURN QUERY
+    SELECT
+        p.patient_id,
+        p.patient_name,
+        p.email,
+        p.mobile,
+        p.gender,
+        p.status,
+        p.address,
+        ts_rank(p.search_vector, v_tsquery) AS rank
+    FROM patients p
+    WHERE p.search_vector @@ v_tsquery
+    AND (p_category IS NULL OR p_category IN ('', 'all') OR p.status = p_category)
+    ORDER BY rank DESC, p.patient_id
+    LIMIT p_limit;
+END;
+$$;
+
+
+-- Source for the in-process name autocomplete index.
+CREATE OR REPLACE FUNCTION get_active_patient_names()
+RETURNS TABLE (
+    patient_id INTEGER,
+    patient_name VARCHAR
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT p.patient_id, p.patient_name
+    FROM patients p
+    WHERE p.status = 'A';
+$$;
+
+
+-- Batch form of display_single_patient: one primary-key probe per id via
+-- = ANY. Row order is not guaranteed; the API restores the request order.
+-- Column types match display_single_patient: both fill patient_cache.
+-- Dropped first because CREATE OR REPLACE cannot change the result columns.
+-- The explicit casts keep both returning TIMESTAMP (UTC in pooled sessions)
+-- whether the table columns are TIMESTAMP or TIMESTAMPTZ.
+DROP FUNCTION IF EXISTS display_patients_by_ids(INTEGER[]);
+
+CREATE OR REPLACE FUNCTION display_patients_by_ids(
+    p_patient_ids INTEGER[]
+)
+RETURNS TABLE (
+    patient_id INTEGER,
+    patient_name VARCHAR,
+    dob DATE,
+    email VARCHAR,
+    mobile VARCHAR,
+    gender CHAR,
+    blood_group VARCHAR,
+    address TEXT,
+    profile_image VARCHAR,
+    status CHAR,
+    created_at TIMESTAMP,
+    created_by INTEGER,
+    updated_at TIMESTAMP,
+    updated_by INTEGER,
+    update_reason VARCHAR
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        p.patient_id,
+        p.patient_name,
+        p.dob,
+        p.email,
+        p.mobile,
+        p.gender,
+        p.blood_group,
+        p.address,
+        p.profile_image,
+        p.status,
+        p.created_at::TIMESTAMP,
+        p.created_by,
+        p.updated_at::TIMESTAMP,
+        p.updated_by,
+        p.update_reason
+    FROM patients p
+    WHERE p.patient_id = ANY(p_patient_ids);
+$$;
+
+
+-- Cheap freshness probe for conditional GETs on a single patient.
+CREATE OR REPLACE FUNCTION patient_version(
+    p_patient_id INTEGER
+)
+RETURNS TABLE (
+    version TIMESTAMPTZ
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT COALESCE(p.updated_at, p.created_at)
+    FROM patients p
+    WHERE p.patient_id = p_patient_id;
+$$;
+
+
+-- Change feed ordering: last change time (updated_at, or created_at for
+-- rows never updated) then patient_id as the tie-breaker.
+CREATE INDEX IF NOT EXISTS idx_patients_changed
+    ON patients ((COALESCE(updated_at, created_at)), patient_id);
+
+-- Rows changed strictly after (p_since, p_since_id). Rows newer than
+-- now() - p_lag_seconds are held back so a transaction that started
+-- earlier but commits later cannot slip in behind a cursor already handed
+-- out.
+CREATE OR REPLACE FUNCTION patient_changes(
+    p_since TIMESTAMPTZ,
+    p_since_id INTEGER,
+    p_lag_seconds INTEGER,
+    p_limit INTEGER
+)
+RETURNS TABLE (
+    patient_id INTEGER,
+    patient_name VARCHAR,
+    dob DATE,
+    email VARCHAR,
+    mobile VARCHAR,
+    gender CHAR,
+    blood_group VARCHAR,
+    address TEXT,
+    status CHAR,
+    created_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ,
+    changed_at TIMESTAMPTZ,
+    change_type TEXT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        p.patient_id,
+        p.patient_name,
+        p.dob,
+        p.email,
+        p.mobile,
+        p.gender,
+        p.blood_group,
+        p.address,
+        p.status,
+        p.created_at,
+        p.updated_at,
+        COALESCE(p.updated_at, p.created_at),
+        CASE
+            WHEN p.status = 'D' THEN 'deleted'
+            WHEN p.updated_at IS NULL THEN 'created'
+            ELSE 'updated'
+        END
+    FROM patients p
+    WHERE (COALESCE(p.updated_at, p.created_at), p.patient_id) > (p_since, p_since_id)
+      AND COALESCE(p.updated_at, p.created_at) <= now() - make_interval(secs => p_lag_seconds)
+    ORDER BY COALESCE(p.updated_at, p.created_at), p.patient_id
+    LIMIT p_limit;
+$$;
+
+
+-- Bulk import: the API COPYs validated rows into this per-transaction
+-- staging table, then merges them with merge_patient_import().
+CREATE OR REPLACE FUNCTION begin_patient_import()
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    CREATE TEMP TABLE patient_import_staging (
+        row_no INTEGER NOT NULL,
+        patient_name VARCHAR(50) NOT NULL,
+        dob DATE NOT NULL,
+        email VARCHAR(100),
+        mobile VARCHAR(15),
+        gender CHAR(1) NOT NULL,
+        blood_group VARCHAR(5),
+        address TEXT,
+        created_by INTEGER NOT NULL
+    ) ON COMMIT DROP;
+END;
+$$;
+
+
+-- One set-based insert of the staged rows. The first row per email wins;
+-- later rows with the same email, and rows whose email is already taken
+-- (create_patient's -1 case), are returned with a reason instead.
+-- ON CONFLICT also covers an email inserted concurrently by another
+-- session, which a NOT EXISTS check would miss and abort the whole import.
+CREATE OR REPLACE FUNCTION merge_patient_import()
+RETURNS TABLE (
+    row_no INTEGER,
+    error TEXT
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    RETURN QUERY
+    WITH ranked AS (
+        SELECT
+            s.*,
+            row_number() OVER (PARTITION BY s.email ORDER BY s.row_no) AS rn
+        FROM patient_import_staging s
+    ),
+    inserted AS (
+        INSERT INTO patients (
+            patient_name,
+            dob,
+            email,
+            mobile,
+            gender,
+            blood_group,
+            address,
+            profile_image,
+            created_by
+        )
+        SELECT
+            r.patient_name,
+            r.dob,
+            r.email,
+            r.mobile,
+            r.gender,
+            r.blood_group,
+            r.address,
+            '/media/defaults/patient.png',
+            r.created_by
+        FROM ranked r
+        WHERE r.rn = 1
+        ORDER BY r.row_no
+        ON CONFLICT (email) DO NOTHING
+        RETURNING patients.email
+    )
+    SELECT
+        r.row_no,
+        CASE
+            WHEN r.rn > 1 THEN 'Duplicate email in file'
+            ELSE 'Email already exists'
+        END
+    FROM ranked r
+    WHERE r.rn > 1
+       OR NOT EXISTS (SELECT 1 FROM inserted i WHERE i.email = r.email)
+    ORDER BY r.row_no;
+END;
+$$;
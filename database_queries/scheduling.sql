@@ -0,0 +1,409 @@
+-- Doctor scheduling: weekly working-hour templates, exceptions (leave,
+-- closures), appointments and free-time queries computed with range
+-- arithmetic.
+-- Template times are wall-clock times in the hospital's time zone, which
+-- callers pass in as p_time_zone (settings.HOSPITAL_TIME_ZONE).
+
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+
+CREATE TABLE IF NOT EXISTS doctor_schedules (
+    schedule_id SERIAL PRIMARY KEY,
+    doctor_id INT NOT NULL REFERENCES doctors(doctor_id) ON DELETE CASCADE,
+    weekday SMALLINT NOT NULL CHECK (weekday BETWEEN 1 AND 7),  -- ISO: 1 = Monday
+    start_time TIME NOT NULL,
+    end_time TIME NOT NULL,
+    slot_minutes SMALLINT NOT NULL DEFAULT 15 CHECK (slot_minutes BETWEEN 5 AND 240),
+    valid_from DATE NOT NULL DEFAULT CURRENT_DATE,
+    valid_to DATE,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    CHECK (end_time > start_time),
+    CHECK (valid_to IS NULL OR valid_to >= valid_from),
+    -- A doctor cannot have two overlapping shifts on the same weekday.
+    EXCLUDE USING gist (
+        doctor_id WITH =,
+        weekday WITH =,
+        daterange(valid_from, valid_to, '[]') WITH &&,
+        tsrange(DATE '2000-01-01' + start_time, DATE '2000-01-01' + end_time) WITH &&
+    )
+);
+
+CREATE TABLE IF NOT EXISTS doctor_schedule_exceptions (
+    exception_id SERIAL PRIMARY KEY,
+    doctor_id INT NOT NULL REFERENCES doctors(doctor_id) ON DELETE CASCADE,
+    period TSTZRANGE NOT NULL CHECK (NOT isempty(period)),
+    reason VARCHAR(200),
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_doctor_schedule_exceptions_period
+    ON doctor_schedule_exceptions USING gist (doctor_id, period);
+
+
+-- Booked appointments. The exclusion constraints are the double-booking
+-- guard: two live ('B') appointments for the same doctor, or the same
+-- patient, cannot overlap. Concurrent bookings only wait on each other
+-- when they touch the same doctor or patient and overlapping time; the
+-- rest of the table is never locked.
+CREATE TABLE IF NOT EXISTS appointments (
+    appointment_id SERIAL PRIMARY KEY,
+    doctor_id INT NOT NULL REFERENCES doctors(doctor_id),
+    patient_id INT NOT NULL REFERENCES patients(patient_id),
+    slot TSTZRANGE NOT NULL CHECK (NOT isempty(slot)),
+    status CHAR(1) NOT NULL DEFAULT 'B' CHECK (status IN ('B', 'C')),  -- booked / cancelled
+    reason VARCHAR(200),
+    created_by INT,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    cancelled_at TIMESTAMPTZ,
+    CONSTRAINT appointments_no_doctor_overlap
+        EXCLUDE USING gist (doctor_id WITH =, slot WITH &&) WHERE (status = 'B'),
+    CONSTRAINT appointments_no_patient_overlap
+        EXCLUDE USING gist (patient_id WITH =, slot WITH &&) WHERE (status = 'B')
+);
+
+
+-- Replaces a doctor's weekly template with p_entries, a JSON array of
+-- {weekday, start_time, end_time, slot_minutes, valid_from, valid_to}.
+-- Returns 1, -1 if the doctor does not exist or is inactive, or -2 if
+-- two entries overlap.
+CREATE OR REPLACE FUNCTION replace_doctor_schedule(p_doctor_id INT, p_entries JSONB)
+RETURNS INT AS $$
+BEGIN
+    PERFORM 1
+    FROM doctors d
+    WHERE d.doctor_id = p_doctor_id
+      AND d.is_active = TRUE
+    FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RETURN -1;
+    END IF;
+
+    DELETE FROM doctor_schedules s
+    WHERE s.doctor_id = p_doctor_id;
+
+    INSERT INTO doctor_schedules (
+        doctor_id,
+        weekday,
+        start_time,
+        end_time,
+        slot_minutes,
+        valid_from,
+        valid_to
+    )
+    SELECT
+        p_doctor_id,
+        (e.entry->>'weekday')::SMALLINT,
+        (e.entry->>'start_time')::TIME,
+        (e.entry->>'end_time')::TIME,
+        COALESCE((e.entry->>'slot_minutes')::SMALLINT, 15),
+        COALESCE((e.entry->>'valid_from')::DATE, CURRENT_DATE),
+        (e.entry->>'valid_to')::DATE
+    FROM jsonb_array_elements(p_entries) AS e(entry);
+
+    RETURN 1;
+
+EXCEPTION
+    WHEN exclusion_violation THEN
+        RETURN -2;   -- overlapping shifts
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION get_doctor_schedule(p_doctor_id INT)
+RETURNS TABLE (
+    schedule_id INT,
+    weekday SMALLINT,
+    start_time TIME,
+    end_time TIME,
+    slot_minutes SMALLINT,
+    valid_from DATE,
+    valid_to DATE
+) AS $$
+    SELECT
+        s.schedule_id,
+        s.weekday,
+        s.start_time,
+        s.end_time,
+        s.slot_minutes,
+        s.valid_from,
+        s.valid_to
+    FROM doctor_schedules s
+    WHERE s.doctor_id = p_doctor_id
+    ORDER BY s.weekday, s.start_time, s.valid_from;
+$$ LANGUAGE sql STABLE;
+
+
+-- Returns the new exception_id, or -1 if the doctor does not exist or is inactive.
+CREATE OR REPLACE FUNCTION add_doctor_schedule_exception(
+    p_doctor_id INT,
+    p_starts_at TIMESTAMPTZ,
+    p_ends_at TIMESTAMPTZ,
+    p_reason VARCHAR
+)
+RETURNS INT AS $$
+DECLARE
+    v_exception_id INT;
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM doctors d
+        WHERE d.doctor_id = p_doctor_id
+          AND d.is_active = TRUE
+    ) THEN
+        RETURN -1;
+    END IF;
+
+    INSERT INTO doctor_schedule_exceptions (doctor_id, period, reason)
+    VALUES (p_doctor_id, tstzrange(p_starts_at, p_ends_at), p_reason)
+    RETURNING exception_id INTO v_exception_id;
+
+    RETURN v_exception_id;
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION delete_doctor_schedule_exception(
+    p_doctor_id INT,
+    p_exception_id INT
+)
+RETURNS BOOLEAN AS $$
+BEGIN
+    DELETE FROM doctor_schedule_exceptions e
+    WHERE e.exception_id = p_exception_id
+      AND e.doctor_id = p_doctor_id;
+
+    RETURN FOUND;
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- Exceptions that end after p_from, i.e. current and upcoming leave.
+CREATE OR REPLACE FUNCTION get_doctor_schedule_exceptions(
+    p_doctor_id INT,
+    p_from TIMESTAMPTZ
+)
+RETURNS TABLE (
+    exception_id INT,
+    starts_at TIMESTAMPTZ,
+    ends_at TIMESTAMPTZ,
+    reason VARCHAR
+) AS $$
+    SELECT
+        e.exception_id,
+        lower(e.period),
+        upper(e.period),
+        e.reason
+    FROM doctor_schedule_exceptions e
+    WHERE e.doctor_id = p_doctor_id
+      AND e.period && tstzrange(p_from, NULL)
+    ORDER BY lower(e.period);
+$$ LANGUAGE sql STABLE;
+
+
+-- Free time per doctor in [p_from, p_to). Each shift of the weekly
+-- template that falls in the range becomes one tstzrange; the doctor's
+-- busy time (exceptions and booked appointments) is merged into one
+-- tstzmultirange and subtracted from it. The remaining pieces are trimmed
+-- to the shift's slot grid.
+-- Every slot in a returned window is free, but the slots themselves are
+-- not generated here. p_doctor_ids and p_qualification_code narrow the
+-- doctors; NULL means no filter.
+CREATE OR REPLACE FUNCTION get_doctor_availability(
+    p_doctor_ids INT[],
+    p_qualification_code VARCHAR,
+    p_from TIMESTAMPTZ,
+    p_to TIMESTAMPTZ,
+    p_time_zone TEXT
+)
+RETURNS TABLE (
+    doctor_id INT,
+    window_start TIMESTAMPTZ,
+    window_end TIMESTAMPTZ,
+    slot_minutes INT
+) AS $$
+    WITH in_scope AS (
+        SELECT dd.doctor_id
+        FROM doctor_directory dd
+        WHERE dd.is_active = TRUE
+          AND (p_doctor_ids IS NULL OR dd.doctor_id = ANY(p_doctor_ids))
+          AND (
+            p_qualification_code IS NULL
+            OR dd.qualifications @> ARRAY[upper(p_qualification_code)::TEXT]
+          )
+    ),
+    days AS (
+        SELECT day::DATE AS day
+        FROM generate_series(
+            (p_from AT TIME ZONE p_time_zone)::DATE,
+            (p_to AT TIME ZONE p_time_zone)::DATE,
+            INTERVAL '1 day'
+        ) AS day
+    ),
+    shifts AS (
+        SELECT
+            s.doctor_id,
+            s.slot_minutes,
+            tstzrange(
+                (d.day + s.start_time) AT TIME ZONE p_time_zone,
+                (d.day + s.end_time) AT TIME ZONE p_time_zone
+            ) AS shift
+        FROM in_scope i
+        JOIN doctor_schedules s ON s.doctor_id = i.doctor_id
+        JOIN days d
+          ON s.weekday = EXTRACT(ISODOW FROM d.day)
+         AND d.day >= s.valid_from
+         AND (s.valid_to IS NULL OR d.day <= s.valid_to)
+    ),
+    busy AS (
+        SELECT b.doctor_id, range_agg(b.period) AS periods
+        FROM (
+            SELECT e.doctor_id, e.period
+            FROM doctor_schedule_exceptions e
+            JOIN in_scope i ON i.doctor_id = e.doctor_id
+            WHERE e.period && tstzrange(p_from, p_to)
+            UNION ALL
+            SELECT a.doctor_id, a.slot
+            FROM appointments a
+            JOIN in_scope i ON i.doctor_id = a.doctor_id
+            WHERE a.status = 'B'
+              AND a.slot && tstzrange(p_from, p_to)
+        ) b
+        GROUP BY b.doctor_id
+    ),
+    pieces AS (
+        SELECT
+            sh.doctor_id,
+            sh.slot_minutes,
+            lower(sh.shift) AS anchor,
+            unnest(
+                tstzmultirange(sh.shift * tstzrange(p_from, p_to))
+                - COALESCE(b.periods, '{}'::tstzmultirange)
+            ) AS piece
+        FROM shifts sh
+        LEFT JOIN busy b ON b.doctor_id = sh.doctor_id
+        WHERE sh.shift && tstzrange(p_from, p_to)
+    ),
+    aligned AS (
+        SELECT
+            p.doctor_id,
+            p.slot_minutes::INT AS slot_minutes,
+            p.anchor + make_interval(mins => p.slot_minutes)
+                * ceil(EXTRACT(EPOCH FROM lower(p.piece) - p.anchor) / 60 / p.slot_minutes)
+                AS window_start,
+            p.anchor + make_interval(mins => p.slot_minutes)
+                * floor(EXTRACT(EPOCH FROM upper(p.piece) - p.anchor) / 60 / p.slot_minutes)
+                AS window_end
+        FROM pieces p
+    )
+    SELECT
+        a.doctor_id,
+        a.window_start,
+        a.window_end,
+        a.slot_minutes
+    FROM aligned a
+    WHERE a.window_end > a.window_start
+    ORDER BY a.doctor_id, a.window_start;
+$$ LANGUAGE sql STABLE;
+
+
+
+-- Books the slot starting at p_starts_at. Returns the new appointment_id, or
+--   -1 doctor not found or inactive
+--   -2 not a slot start inside the doctor's working hours
+--   -3 doctor is on leave at that time
+--   -4 slot already booked
+--   -5 patient already has an appointment at that time
+--   -6 patient not found or inactive
+--   -7 p_starts_at is in the past
+CREATE OR REPLACE FUNCTION book_appointment(
+    p_doctor_id INT,
+    p_patient_id INT,
+    p_starts_at TIMESTAMPTZ,
+    p_reason VARCHAR,
+    p_created_by INT,
+    p_time_zone TEXT
+)
+RETURNS INT AS $$
+DECLARE
+    v_local TIMESTAMP := p_starts_at AT TIME ZONE p_time_zone;
+    v_slot_minutes INT;
+    v_slot TSTZRANGE;
+    v_appointment_id INT;
+    v_constraint TEXT;
+BEGIN
+    IF p_starts_at < NOW() THEN
+        RETURN -7;
+    END IF;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM doctors d
+        WHERE d.doctor_id = p_doctor_id
+          AND d.is_active = TRUE
+    ) THEN
+        RETURN -1;
+    END IF;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM patients p
+        WHERE p.patient_id = p_patient_id
+          AND p.status = 'A'
+    ) THEN
+        RETURN -6;
+    END IF;
+
+    SELECT s.slot_minutes INTO v_slot_minutes
+    FROM doctor_schedules s
+    WHERE s.doctor_id = p_doctor_id
+      AND s.weekday = EXTRACT(ISODOW FROM v_local)
+      AND v_local::DATE >= s.valid_from
+      AND (s.valid_to IS NULL OR v_local::DATE <= s.valid_to)
+      AND v_local::TIME >= s.start_time
+      AND (v_local::TIME - s.start_time) + make_interval(mins => s.slot_minutes)
+          <= (s.end_time - s.start_time)
+      -- Unrounded seconds, so a start a fraction of a second off the grid fails.
+      AND EXTRACT(EPOCH FROM v_local::TIME - s.start_time) % (s.slot_minutes * 60) = 0;
+
+    IF NOT FOUND THEN
+        RETURN -2;
+    END IF;
+
+    v_slot := tstzrange(p_starts_at, p_starts_at + make_interval(mins => v_slot_minutes));
+
+    IF EXISTS (
+        SELECT 1 FROM doctor_schedule_exceptions e
+        WHERE e.doctor_id = p_doctor_id
+          AND e.period && v_slot
+    ) THEN
+        RETURN -3;
+    END IF;
+
+    INSERT INTO appointments (doctor_id, patient_id, slot, reason, created_by)
+    VALUES (p_doctor_id, p_patient_id, v_slot, p_reason, p_created_by)
+    RETURNING appointment_id INTO v_appointment_id;
+
+    RETURN v_appointment_id;
+
+EXCEPTION
+    WHEN exclusion_violation THEN
+        GET STACKED DIAGNOSTICS v_constraint = CONSTRAINT_NAME;
+        IF v_constraint = 'appointments_no_patient_overlap' THEN
+            RETURN -5;
+        END IF;
+        RETURN -4;
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION cancel_appointment(p_appointment_id INT)
+RETURNS BOOLEAN AS $$
+BEGIN
+    UPDATE appointments a
+    SET
+        status = 'C',
+        cancelled_at = NOW()
+    WHERE a.appointment_id = p_appointment_id
+      AND a.status = 'B';
+
+    RETURN FOUND;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,137 @@
+import os
+import random
+import threading
+import time
+from datetime import date, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+BASE_URL = "http://localhost:8000/doctor/"
+ACCESS_TOKEN = os.getenv("ACCESS_TOKEN", "")  # JWT from /user/login/
+
+DOCTOR_ID = 1  # the "popular" doctor everyone books
+PATIENT_IDS = range(1, 501)  # existing active patients to book for
+BOOKING_DAY = date.today() + timedelta(days=1)  # needs working hours in the doctor's schedule
+
+THREAD_COUNTS = [1, 2, 4, 8, 16, 32, 64]
+REQUESTS_PER_ROUND = 300
+
+HEADERS = {"Authorization": f"Bearer {ACCESS_TOKEN}"}
+
+lock = threading.Lock()
+
+
+def free_slots():
+    r = requests.get(
+        BASE_URL + "availability/",
+        params={
+            "doctor_ids": DOCTOR_ID,
+            "start": BOOKING_DAY.isoformat(),
+            "end": BOOKING_DAY.isoformat(),
+            "expand": "slots",
+        },
+        headers=HEADERS,
+        timeout=10,
+    )
+    r.raise_for_status()
+    slots = []
+    for doctor in r.json()["data"]:
+        for window in doctor["windows"]:
+            slots.extend(window["slot_starts"])
+    return slots
+
+
+def book(slot, stats, booked):
+    data = {"patient_id": random.choice(PATIENT_IDS), "starts_at": slot}
+    started = time.perf_counter()
+    try:
+        r = requests.post(
+            f"{BASE_URL}appointments/{DOCTOR_ID}/book/",
+            json=data,
+            headers=HEADERS,
+            timeout=10,
+        )
+        code = r.status_code
+        body = r.json() if code in (201, 409) else {}
+    except Exception:
+        code, body = None, {}
+    elapsed = time.perf_counter() - started
+
+    with lock:
+        stats["latency"].append(elapsed)
+        if code == 201:
+            stats["booked"] += 1
+            booked.append(body["appointment_id"])
+        elif code == 409 and body.get("code") == "slot_taken":
+            stats["slot_taken"] += 1
+        elif code == 409:
+            stats["other_conflict"] += 1
+        else:
+            stats["errors"] += 1
+
+
+def cancel(appointment_ids):
+    for appointment_id in appointment_ids:
+        requests.post(
+            f"{BASE_URL}appointments/{appointment_id}/cancel/",
+            headers=HEADERS,
+            timeout=10,
+        )
+
+
+def run_round(threads, slots):
+    stats = {
+        "booked": 0,
+        "slot_taken": 0,
+        "other_conflict": 0,
+        "errors": 0,
+        "latency": [],
+    }
+    booked = []
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for _ in range(REQUESTS_PER_ROUND):
+            executor.submit(book, random.choice(slots), stats, booked)
+    elapsed = time.perf_counter() - started
+
+    # Free the slots again so every round starts from the same state.
+    cancel(booked)
+
+    latency = sorted(stats["latency"])
+    p95 = latency[int(len(latency) * 0.95) - 1] if latency else 0.0
+    conflicts = stats["slot_taken"] + stats["other_conflict"]
+    print(
+        f"{threads:>7} | {REQUESTS_PER_ROUND / elapsed:>8.1f} | "
+        f"{stats['booked']:>6} | {stats['slot_taken']:>10} | "
+        f"{stats['other_conflict']:>8} | {stats['errors']:>6} | "
+        f"{conflicts / REQUESTS_PER_ROUND:>8.1%} | {p95 * 1000:>7.1f}"
+    )
+    return len(booked)
+
+
+def main():
+    if not ACCESS_TOKEN:
+        print("⛔ Set ACCESS_TOKEN to a valid JWT first")
+        return
+
+    slots = free_slots()
+    if not slots:
+        print(f"⛔ Doctor {DOCTOR_ID} has no free slots on {BOOKING_DAY}; set a schedule first")
+        return
+
+    print(f"🚀 Booking doctor {DOCTOR_ID} on {BOOKING_DAY}: {len(slots)} free slots")
+    print(f"📦 {REQUESTS_PER_ROUND} booking requests per round\n")
+    print("threads |    req/s | booked | slot_taken | patient  | errors | conflict |  p95 ms")
+    print("--------+----------+--------+------------+----------+--------+----------+--------")
+
+    for threads in THREAD_COUNTS:
+        booked = run_round(threads, slots)
+        # Never more than one booking per slot, whatever the concurrency.
+        if booked > len(slots):
+            print(f"❌ Double booking detected: {booked} bookings for {len(slots)} slots")
+
+
+if __name__ == "__main__":
+    main()